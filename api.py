@@ -17,11 +17,12 @@ def extract_text_with_ocr(pdf_path: str) -> tuple:
     try:
         images = convert_from_path(pdf_path, dpi=300)
         page_count = len(images)
-        text = ""
+        parts = []
         for i, image in enumerate(images, 1):
             page_text = pytesseract.image_to_string(image, lang='spa+eng')
             if page_text.strip():
-                text += f"\n--- PAGE {i} ---\n{page_text}\n"
+                parts.append(f"\n--- PAGE {i} ---\n{page_text}\n")
+        text = "".join(parts)
         return text.strip(), page_count
     except Exception as e:
         return None, 0
@@ -29,12 +30,13 @@ def extract_text_with_ocr(pdf_path: str) -> tuple:
 def extract_text_from_pdf(pdf_path: str) -> tuple:
     try:
         with pdfplumber.open(pdf_path) as pdf:
-            text = ""
+            parts = []
             page_count = len(pdf.pages)
             for i, page in enumerate(pdf.pages, 1):
                 page_text = page.extract_text()
                 if page_text:
-                    text += f"\n--- PAGE {i} ---\n{page_text}\n"
+                    parts.append(f"\n--- PAGE {i} ---\n{page_text}\n")
+            text = "".join(parts)
         if not text.strip():
             return extract_text_with_ocr(pdf_path)
         return text.strip(), page_count
@@ -44,6 +46,7 @@ def extract_text_from_pdf(pdf_path: str) -> tuple:
 def extract_data_with_llm(pdf_text: str, api_key: str, page_count: int) -> dict:
     try:
         client = Groq(api_key=api_key)
+        extraction_max_tokens = min(4000, max(2500, 600 + 300 * page_count))
         prompt = f"""Extract ALL data from this Uruguayan certificate EXACTLY as written.
 This document has {page_count} page(s). Extract information from ALL pages.
 Do not translate, do not modify. Preserve exact spelling, accents, capitalization, and punctuation.
@@ -76,7 +79,7 @@ Return ONLY the JSON, no explanations."""
                 {"role": "user", "content": prompt}
             ],
             temperature=0,
-            max_tokens=4000
+            max_tokens=extraction_max_tokens
         )
         result_text = response.choices[0].message.content.strip()
         if result_text.startswith('```'):
@@ -142,7 +145,7 @@ Return ONLY the JSON object, no explanations or comments."""
                 {"role": "user", "content": prompt}
             ],
             temperature=0,
-            max_tokens=2000
+            max_tokens=800
         )
         result_text = response.choices[0].message.content.strip()
         if result_text.startswith('```'):
@@ -5,9 +5,11 @@ Provides utilities to query and analyze certificate history per customer.
 
 from typing import List, Dict, Optional
 from datetime import datetime
-from collections import defaultdict
+import heapq
+from collections import Counter, defaultdict
+from operator import attrgetter, itemgetter
 
-from models import CustomerRegistry, CertificateRecord, Customer, CertificateStatus
+from models import CustomerRegistry, CertificateRecord, Customer
 
 
 class CertificateTracker:
@@ -88,7 +90,7 @@ class CertificateTracker:
             List of CertificateRecord objects with errors
         """
         all_certs = self.registry.get_customer_certificates(customer_id)
-        return [cert for cert in all_certs if cert.has_error_prefix or cert.status == CertificateStatus.ERROR]
+        return [cert for cert in all_certs if cert.is_error]
 
     def get_certificates_by_institution(self, customer_id: str, institution: str) -> List[CertificateRecord]:
         """
@@ -119,20 +121,13 @@ class CertificateTracker:
             return {}
 
         certificates = self.registry.get_customer_certificates(customer_id)
-        error_certs = self.get_error_history(customer_id)
+        error_certs = [cert for cert in certificates if cert.is_error]
 
         # Group by institution
-        by_institution = defaultdict(int)
-        for cert in certificates:
-            if cert.institution:
-                by_institution[cert.institution] += 1
+        by_institution = Counter(cert.institution for cert in certificates if cert.institution)
 
         # Recent certificates (last 5)
-        recent = sorted(
-            [c for c in certificates if c.date],
-            key=lambda c: c.date,
-            reverse=True
-        )[:5]
+        recent = heapq.nlargest(5, (c for c in certificates if c.date), key=attrgetter('date'))
 
         return {
             'customer_id': customer.customer_id,
@@ -192,12 +187,13 @@ class CertificateTracker:
         })
 
         for cert in self.registry.certificates:
-            if cert.institution:
-                inst = cert.institution
-                institution_data[inst]['total'] += 1
-                if cert.has_error_prefix or cert.status == CertificateStatus.ERROR:
-                    institution_data[inst]['errors'] += 1
-                institution_data[inst]['customers'].add(cert.customer_id)
+            inst = cert.institution
+            if inst:
+                data = institution_data[inst]
+                data['total'] += 1
+                if cert.is_error:
+                    data['errors'] += 1
+                data['customers'].add(cert.customer_id)
 
         # Convert sets to counts
         result = {}
@@ -290,7 +286,7 @@ class CertificateTracker:
         ]
 
         # Sort by error count
-        customer_errors.sort(key=lambda x: x['error_count'], reverse=True)
+        customer_errors.sort(key=itemgetter('error_count'), reverse=True)
 
         return {
             'total_error_certificates': len(error_certs),
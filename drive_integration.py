@@ -140,16 +140,17 @@ class DriveIntegration:
             print(f"  ✓ Customer: {folder_name} ({customer_type})")
 
             # Create certificates from files
-            for file_meta in stats.get('file_metadata', []):
-                cert = self._create_certificate_from_file(customer_id, file_meta)
-                if cert:
-                    registry.add_certificate(cert)
+            certificates = (
+                self._create_certificate_from_file(customer_id, file_meta)
+                for file_meta in stats.get('file_metadata', [])
+            )
+            registry.extend_certificates(cert for cert in certificates if cert)
 
         return registry
 
     def _generate_customer_id(self, folder_name: str) -> str:
         """Generate unique customer ID from folder name"""
-        return hashlib.md5(folder_name.encode()).hexdigest()[:12]
+        return hashlib.blake2b(folder_name.encode('utf-8'), digest_size=6).hexdigest()
 
     def _detect_customer_type(self, name: str) -> CustomerType:
         """
@@ -161,17 +162,9 @@ class DriveIntegration:
         Returns:
             CustomerType.PERSON or CustomerType.COMPANY
         """
-        name_lower = name.lower()
-
-        # Company keywords
-        company_keywords = [
-            'sociedad', 'anónima', 's.a.', 'sa', 'srl', 's.r.l.',
-            'ltda', 'limitada', 'empresa', 'corporación', 'corp'
-        ]
-
-        for keyword in company_keywords:
-            if keyword in name_lower:
-                return CustomerType.COMPANY
+        # Company keywords as whole words (shared with the folder scanner)
+        if FolderScanner.has_company_keyword(name):
+            return CustomerType.COMPANY
 
         # Multiple words suggests company
         if len(name.split()) > 3:
@@ -197,16 +190,19 @@ class DriveIntegration:
         filename = file_meta['file_name']
         file_path = file_meta['local_path']
 
+        # Lowercase once; all filename checks work on this
+        name_lower = filename.lower()
+
         # Check if this is a certificate file
-        if not self._is_certificate_file(filename):
+        if not self._is_certificate_file(name_lower):
             return None
 
         # Generate certificate ID
         cert_id = self._generate_certificate_id(customer_id, filename)
 
         # Extract metadata
-        has_error, status = self._extract_error_status(filename)
-        institution = self._extract_institution(filename)
+        has_error, status = self._extract_error_status(name_lower)
+        institution = self._extract_institution(name_lower)
         date = None  # Date extraction handled in Milestone 1's scanner
 
         certificate = CertificateRecord(
@@ -226,31 +222,20 @@ class DriveIntegration:
 
         return certificate
 
-    def _is_certificate_file(self, filename: str) -> bool:
-        """Check if file is likely a certificate"""
-        filename_lower = filename.lower()
+    def _is_certificate_file(self, name_lower: str) -> bool:
+        """Check if file (lowercased name) is likely a certificate"""
+        return any(keyword in name_lower for keyword in FolderScanner.CERTIFICATE_KEYWORDS)
 
-        certificate_keywords = [
-            'certificado', 'certifica', 'constancia', 'personería',
-            'firma', 'vigencia', 'poderes', 'bps', 'msp', 'abitab'
-        ]
-
-        return any(keyword in filename_lower for keyword in certificate_keywords)
-
-    def _extract_error_status(self, filename: str) -> tuple:
-        """Extract error status from filename"""
-        has_error = filename.upper().startswith('ERROR')
+    def _extract_error_status(self, name_lower: str) -> tuple:
+        """Extract error status from lowercased filename"""
+        has_error = name_lower.startswith('error')
         status = CertificateStatus.ERROR if has_error else CertificateStatus.OK
         return has_error, status
 
-    def _extract_institution(self, filename: str) -> Optional[str]:
-        """Extract institution name from filename"""
-        filename_upper = filename.upper()
-
-        institutions = ['BPS', 'MSP', 'ABITAB', 'DGI', 'ASSE', 'ANTEL', 'UTE', 'OSE']
-
-        for inst in institutions:
-            if inst in filename_upper:
+    def _extract_institution(self, name_lower: str) -> Optional[str]:
+        """Extract institution name from lowercased filename"""
+        for inst_lower, inst in FolderScanner.INSTITUTION_NAMES.items():
+            if inst_lower in name_lower:
                 return inst
 
         return None
@@ -258,7 +243,7 @@ class DriveIntegration:
     def _generate_certificate_id(self, customer_id: str, filename: str) -> str:
         """Generate unique certificate ID"""
         combined = f"{customer_id}_{filename}"
-        return hashlib.md5(combined.encode()).hexdigest()[:16]
+        return hashlib.blake2b(combined.encode('utf-8'), digest_size=8).hexdigest()
 
     def scan_local_downloads(self) -> CustomerRegistry:
         """
@@ -13,142 +13,21 @@ from dotenv import load_dotenv
 import sys
 import json
 from pathlib import Path
-import pdfplumber
-from groq import Groq
-from pdf2image import convert_from_path
-import pytesseract
-from PIL import Image
 
-
-def extract_text_with_ocr(pdf_path: str) -> tuple:
-    """Extract text from scanned PDF using OCR
-    Returns: (text, page_count)
-    """
-    try:
-        print("  - PDF appears to be scanned/image-based, using OCR...")
-
-        # Convert PDF to images
-        images = convert_from_path(pdf_path, dpi=300)
-        page_count = len(images)
-
-        text = ""
-        for i, image in enumerate(images, 1):
-            print(f"  - OCR processing page {i}/{page_count}...")
-            # Use Tesseract OCR with Spanish language support
-            page_text = pytesseract.image_to_string(image, lang='spa+eng')
-            if page_text.strip():
-                text += f"\n--- PAGE {i} ---\n{page_text}\n"
-                print(f"  - Extracted page {i}/{page_count} ({len(page_text.strip())} chars)")
-            else:
-                print(f"  - Warning: Page {i} OCR returned no text")
-
-        return text.strip(), page_count
-    except Exception as e:
-        print(f"Error with OCR extraction: {e}")
-        print("Note: Ensure tesseract-ocr is installed: sudo apt-get install tesseract-ocr tesseract-ocr-spa poppler-utils")
-        return None, 0
-
-
-def extract_text_from_pdf(pdf_path: str) -> tuple:
-    """Extract text from PDF using pdfplumber, fallback to OCR if needed
-    Returns: (text, page_count)
-    """
-    try:
-        # First, try standard text extraction
-        with pdfplumber.open(pdf_path) as pdf:
-            text = ""
-            page_count = len(pdf.pages)
-            print(f"  - Total pages: {page_count}")
-
-            for i, page in enumerate(pdf.pages, 1):
-                page_text = page.extract_text()
-                if page_text:
-                    text += f"\n--- PAGE {i} ---\n{page_text}\n"
-                    print(f"  - Extracted page {i}/{page_count} ({len(page_text)} chars)")
-                else:
-                    print(f"  - Warning: Page {i} has no extractable text")
-
-        # If no text was extracted, use OCR
-        if not text.strip():
-            print("\n  - No text found with standard extraction")
-            return extract_text_with_ocr(pdf_path)
-
-        return text.strip(), page_count
-    except Exception as e:
-        print(f"Error extracting text from PDF: {e}")
-        return None, 0
-
-
-def extract_data_with_llm(
-    pdf_text: str, api_key: str, page_count: int) -> dict:
-    """Extract structured data using Groq Llama 4"""
-    try:
-        client = Groq(api_key=api_key)
-
-        prompt = f"""Extract ALL data from this Uruguayan certificate EXACTLY as written.
-This document has {page_count} page(s). Extract information from ALL pages.
-Do not translate, do not modify. Preserve exact spelling, accents, capitalization, and punctuation.
-
-Certificate text:
-{pdf_text}
-
-Return ONLY valid JSON with these fields (use null if field not found):
-{{
-  "document_type": "Type of certificate (e.g., DGI, BPS, MSP)",
-  "rut": "RUT number if present",
-  "denominacion": "Company/person name exactly as written",
-  "constancia_number": "Certificate/constancia number",
-  "fecha": "Date (preserve format)",
-  "domicilio_fiscal": "Fiscal address exactly as written",
-  "tipo_contribuyente": "Type of taxpayer",
-  "estado": "Status/state",
-  "emision": "Emission/issue date",
-  "vencimiento": "Expiration date",
-  "other_fields": {{}}
-}}
-
-Extract EVERY field you see across ALL {page_count} page(s). If there are additional fields not listed, add them to "other_fields".
-Return ONLY the JSON, no explanations."""
-
-        print(f"  - Sending {len(pdf_text)} characters to LLM...")
-
-        response = client.chat.completions.create(
-            model='meta-llama/llama-4-maverick-17b-128e-instruct',  # Groq's Llama 4 maverick
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a precise data extraction assistant. Extract data EXACTLY as written from ALL pages, preserving all Spanish characters, accents, and formatting. Return only valid JSON."
-                },
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            temperature=0,  # Maximum precision
-            max_tokens=4000  # Increased for multi-page documents
-        )
-
-        result_text = response.choices[0].message.content.strip()
-
-        # Remove markdown code blocks if present
-        if result_text.startswith('```'):
-            result_text = result_text.split('```')[1]
-            if result_text.startswith('json'):
-                result_text = result_text[4:]
-            result_text = result_text.strip()
-
-        # Parse JSON response
-        extracted_data = json.loads(result_text)
-        return extracted_data
-
-    except Exception as e:
-        print(f"Error with Groq API: {e}")
-        return None
+from pdf_extract_core import (
+    GROQ_MODEL,
+    extract_text_from_pdf,
+    extract_data_with_llm,
+    parse_llm_json,
+    save_extracted_data
+)
 
 
 def validate_certificate_requirements(pdf_text: str, api_key: str, page_count: int) -> dict:
     """Validate certificate requirements for Track A (legal validation)"""
     try:
+        from groq import Groq
+
         client = Groq(api_key=api_key)
 
         prompt = f"""Analyze this Uruguayan notarial document and validate which legal requirements are met.
@@ -201,7 +80,7 @@ Return ONLY the JSON object, no explanations or comments."""
         print(f"  - Validating legal requirements...")
 
         response = client.chat.completions.create(
-            model='meta-llama/llama-4-maverick-17b-128e-instruct',
+            model=GROQ_MODEL,
             messages=[
                 {
                     "role": "system",
@@ -213,20 +92,11 @@ Return ONLY the JSON object, no explanations or comments."""
                 }
             ],
             temperature=0,
-            max_tokens=2000
+            max_tokens=800  # Schema is only boolean flags plus certificate_type
         )
 
-        result_text = response.choices[0].message.content.strip()
-
-        # Remove markdown code blocks if present
-        if result_text.startswith('```'):
-            result_text = result_text.split('```')[1]
-            if result_text.startswith('json'):
-                result_text = result_text[4:]
-            result_text = result_text.strip()
-
         # Parse JSON response
-        validation_data = json.loads(result_text)
+        validation_data = parse_llm_json(response.choices[0].message.content)
         return validation_data
 
     except Exception as e:
@@ -234,13 +104,6 @@ Return ONLY the JSON object, no explanations or comments."""
         return None
 
 
-def save_extracted_data(data: dict, output_path: str):
-    """Save extracted data to JSON file"""
-    with open(output_path, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
-    print(f"✓ Saved to: {output_path}")
-
-
 def main():
      # Load .env file
     load_dotenv()
@@ -4,8 +4,11 @@ Detects and validates file types for certificate processing.
 """
 
 import mimetypes
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple, Union
 from enum import Enum
 
 try:
@@ -58,6 +61,9 @@ class FileDetector:
         '.txt': FileType.TEXT,
     }
 
+    # Bytes read from the start of a file for content-based detection
+    MAGIC_HEADER_BYTES = 4096
+
     def __init__(self):
         """Initialize file detector"""
         self.magic_available = PYTHON_MAGIC_AVAILABLE
@@ -69,12 +75,17 @@ class FileDetector:
                 print(f"Warning: python-magic initialization failed: {e}")
                 self.magic_available = False
 
-    def detect_from_content(self, file_path: Path) -> Optional[str]:
+    def detect_from_content(
+        self,
+        file_path: Union[str, os.PathLike],
+        header: Optional[bytes] = None
+    ) -> Optional[str]:
         """
         Detect MIME type from file content using python-magic.
 
         Args:
-            file_path: Path to file
+            file_path: Path to file (str or Path)
+            header: First MAGIC_HEADER_BYTES of the file, if already read
 
         Returns:
             MIME type string or None
@@ -83,42 +94,54 @@ class FileDetector:
             return None
 
         try:
-            mime_type = self.mime.from_file(str(file_path))
+            # Signatures libmagic recognizes live in the file header,
+            # so avoid reading the whole (possibly multi-MB) file
+            if header is None:
+                with open(file_path, 'rb') as fh:
+                    header = fh.read(self.MAGIC_HEADER_BYTES)
+            mime_type = self.mime.from_buffer(header)
             return mime_type
         except Exception as e:
-            print(f"Warning: Magic detection failed for {file_path.name}: {e}")
+            print(f"Warning: Magic detection failed for {os.path.basename(file_path)}: {e}")
             return None
 
-    def detect_from_extension(self, file_path: Path) -> Optional[str]:
+    def detect_from_extension(self, file_path: Union[str, os.PathLike]) -> Optional[str]:
         """
         Detect MIME type from file extension.
 
         Args:
-            file_path: Path to file
+            file_path: Path to file (str or Path)
 
         Returns:
             MIME type string or None
         """
-        mime_type, _ = mimetypes.guess_type(str(file_path))
+        mime_type, _ = mimetypes.guess_type(file_path)
         return mime_type
 
-    def detect_file_type(self, file_path: Path) -> FileType:
+    def detect_file_type_with_mime(
+        self,
+        file_path: Union[str, os.PathLike],
+        header: Optional[bytes] = None
+    ) -> Tuple[FileType, Optional[str]]:
         """
-        Detect file type using best available method.
+        Detect file type and the MIME type it was derived from.
 
         Args:
-            file_path: Path to file
+            file_path: Path to file (str or Path; a plain str avoids
+                       building Path objects in scanning loops)
+            header: First MAGIC_HEADER_BYTES of the file, if already read
+                    (the file is then known to exist and is not reopened)
 
         Returns:
-            FileType enum
+            Tuple of (FileType enum, MIME type string or None)
         """
-        if not file_path.exists():
-            return FileType.UNKNOWN
+        if header is None and not os.path.exists(file_path):
+            return FileType.UNKNOWN, None
 
         # Try content-based detection first (most accurate)
         mime_type = None
         if self.magic_available:
-            mime_type = self.detect_from_content(file_path)
+            mime_type = self.detect_from_content(file_path, header)
 
         # Fallback to extension-based detection
         if not mime_type:
@@ -126,11 +149,24 @@ class FileDetector:
 
         # Fallback to extension mapping if mime type detection failed
         if not mime_type:
-            extension = file_path.suffix.lower()
-            return self.EXTENSION_MAP.get(extension, FileType.UNKNOWN)
+            extension = os.path.splitext(file_path)[1].lower()
+            return self.EXTENSION_MAP.get(extension, FileType.UNKNOWN), None
 
         # Map MIME type to FileType
-        return self.MIME_TYPE_MAP.get(mime_type, FileType.UNKNOWN)
+        return self.MIME_TYPE_MAP.get(mime_type, FileType.UNKNOWN), mime_type
+
+    def detect_file_type(self, file_path: Union[str, os.PathLike]) -> FileType:
+        """
+        Detect file type using best available method.
+
+        Args:
+            file_path: Path to file (str or Path)
+
+        Returns:
+            FileType enum
+        """
+        file_type, _ = self.detect_file_type_with_mime(file_path)
+        return file_type
 
     def is_document(self, file_type: FileType) -> bool:
         """Check if file type is a document (PDF, DOCX, DOC, TEXT)"""
@@ -161,8 +197,8 @@ class FileDetector:
                 'file_path': str(file_path)
             }
 
-        file_type = self.detect_file_type(file_path)
-        mime_type = self.detect_from_content(file_path) or self.detect_from_extension(file_path)
+        file_type, mime_type = self.detect_file_type_with_mime(file_path)
+        size_bytes = file_path.stat().st_size
 
         return {
             'exists': True,
@@ -170,8 +206,8 @@ class FileDetector:
             'file_path': str(file_path),
             'file_type': file_type,
             'mime_type': mime_type,
-            'size_bytes': file_path.stat().st_size,
-            'size_mb': round(file_path.stat().st_size / (1024 * 1024), 2),
+            'size_bytes': size_bytes,
+            'size_mb': round(size_bytes / (1024 * 1024), 2),
             'extension': file_path.suffix.lower(),
             'is_document': self.is_document(file_type),
             'is_image': self.is_image(file_type),
@@ -201,16 +237,19 @@ class FileDetector:
             'files': []
         }
 
-        for file_path in directory_path.rglob('*'):
-            if not file_path.is_file():
-                continue
+        file_paths = [p for p in directory_path.rglob('*') if p.is_file()]
+
+        # Detection is I/O-bound (stat + header read), so overlap it across threads
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            file_types = list(executor.map(self.detect_file_type, file_paths))
 
-            stats['total_files'] += 1
-            file_type = self.detect_file_type(file_path)
+        stats['total_files'] = len(file_paths)
 
-            # Count by type
-            stats['by_type'][file_type] = stats['by_type'].get(file_type, 0) + 1
+        # Count by type
+        stats['by_type'] = dict(Counter(file_types))
 
+        for file_path, file_type in zip(file_paths, file_types):
             # Category counts
             if self.is_document(file_type):
                 stats['documents'] += 1
@@ -270,9 +309,10 @@ if __name__ == '__main__':
 
         info = detector.get_file_info(file_path)
 
-        print("\nFile Information:")
-        for key, value in info.items():
-            print(f"  {key}: {value}")
+        # One write for the whole block instead of a print per field
+        lines = ["\nFile Information:"]
+        lines.extend(f"  {key}: {value}" for key, value in info.items())
+        print("\n".join(lines))
     else:
         print("\nUsage: python file_detector.py <file_path>")
         print("Example: python file_detector.py certificate.pdf")
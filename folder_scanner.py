@@ -3,12 +3,23 @@ Track B - Milestone 1: Folder Scanner
 Scans customer folders and indexes certificates.
 """
 
+import json
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple, Optional, Union
 from datetime import datetime
+from calendar import monthrange
 import hashlib
+import threading
+from collections import Counter
+
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
 
 from models import (
     Customer,
@@ -19,6 +30,126 @@ from models import (
 )
 
 
+# Date patterns recognized in certificate filenames, in priority order,
+# with the group numbers holding (year, month, day)
+_DATE_PATTERNS = (
+    (re.compile(r'(\d{4})[-_](\d{2})[-_](\d{2})'), (1, 2, 3)),   # YYYY-MM-DD / YYYY_MM_DD
+    (re.compile(r'(\d{2})[-_](\d{2})[-_](\d{4})'), (3, 2, 1)),   # DD-MM-YYYY / DD_MM_YYYY
+    (re.compile(r'(\d{4})(\d{2})(\d{2})'), (1, 2, 3)),           # YYYYMMDD
+)
+
+# Words in a customer name (dots kept so 'S.A.' stays one token)
+_WORD_RE = re.compile(r'[\w.]+')
+
+# Hyperscan pattern IDs; institution IDs start at _HS_FIRST_INSTITUTION
+_HS_ERROR = 0
+_HS_DATE = 1
+_HS_FIRST_INSTITUTION = 2
+
+
+def _date_from_filename(filename: str) -> Optional[datetime]:
+    """
+    Find a date in a filename.
+    Each format is searched separately, in priority order (YYYY-MM-DD,
+    DD-MM-YYYY, YYYYMMDD), and only its first occurrence is considered;
+    fields are range-checked before constructing so false positives such as
+    version numbers don't go through ValueError handling.
+    """
+    for pattern, (year_group, month_group, day_group) in _DATE_PATTERNS:
+        match = pattern.search(filename)
+        if match:
+            year = int(match.group(year_group))
+            month = int(match.group(month_group))
+            day = int(match.group(day_group))
+            if year >= 1 and 1 <= month <= 12 and 1 <= day <= monthrange(year, month)[1]:
+                return datetime(year, month, day)
+
+    return None
+
+
+def _on_hyperscan_match(pattern_id: int, start: int, end: int, flags: int, state: list) -> None:
+    """Hyperscan match callback; state is [has_error, inst_index, has_date]"""
+    if pattern_id == _HS_ERROR:
+        state[0] = True
+    elif pattern_id == _HS_DATE:
+        state[2] = True
+    else:
+        # Keep the institution listed first in INSTITUTIONS, wherever it
+        # occurs in the name (same rule as _match_institution)
+        inst_index = pattern_id - _HS_FIRST_INSTITUTION
+        if state[1] is None or inst_index < state[1]:
+            state[1] = inst_index
+
+
+def _build_keyword_predicate(keywords: List[str]) -> Callable[[str], bool]:
+    """
+    Build a function telling whether a string contains any of the keywords.
+    The keyword list is fixed, so the check is generated as one straight-line
+    expression ('a' in text or 'b' in text or ...) with the keywords as
+    constants, which beats a regex or automaton for a handful of short words.
+    """
+    body = ' or '.join(f"{keyword!r} in text" for keyword in keywords) or 'False'
+    namespace = {}
+    exec(f"def has_keyword(text):\n    return {body}\n", namespace)
+    return namespace['has_keyword']
+
+
+def _iter_files(
+    entries: Iterable[os.DirEntry],
+    dir_mtimes: Optional[Dict[str, int]] = None
+) -> Iterator[os.DirEntry]:
+    """
+    Recursively yield file entries from a directory listing.
+    Uses os.scandir so file/dir checks come from the directory listing
+    instead of a stat() call per entry.
+
+    Same traversal as Path.rglob('*') filtered by is_file(): symlinks to
+    files are yielded, symlinked directories are not descended into, and
+    subdirectories that can't be listed (PermissionError) are skipped.
+
+    If dir_mtimes is given, the mtime of every subdirectory visited is
+    recorded in it (path -> st_mtime_ns).
+    """
+    for entry in entries:
+        if entry.is_dir(follow_symlinks=False):
+            if dir_mtimes is not None:
+                # Taken before listing, so changes made during the scan
+                # show up as a newer mtime next time
+                dir_mtimes[entry.path] = entry.stat(follow_symlinks=False).st_mtime_ns
+            try:
+                it = os.scandir(entry.path)
+            except PermissionError:
+                if dir_mtimes is not None:
+                    # Never matches, so the folder is rescanned next time
+                    # (a permission change does not update the mtime)
+                    dir_mtimes[entry.path] = -1
+                continue
+            with it:
+                yield from _iter_files(it, dir_mtimes)
+        elif entry.is_file():
+            yield entry
+
+
+def iter_files(root: Union[str, os.PathLike]) -> Iterator[os.DirEntry]:
+    """
+    Recursively yield file entries under root (see _iter_files for the
+    symlink and permission handling). Like Path.rglob, yields nothing if
+    root itself can't be listed.
+
+    Args:
+        root: Directory to walk
+
+    Yields:
+        os.DirEntry for each file
+    """
+    try:
+        it = os.scandir(root)
+    except PermissionError:
+        return
+    with it:
+        yield from _iter_files(it)
+
+
 class FolderScanner:
     """
     Scans directory structure to identify customers and their certificates.
@@ -28,6 +159,10 @@ class FolderScanner:
     # Common certificate file extensions
     CERTIFICATE_EXTENSIONS = {'.pdf', '.docx', '.doc', '.txt'}
 
+    # Last 4 characters of those extensions, for a cheap prefilter on the raw
+    # filename (assumes every extension is at least 4 characters incl. dot)
+    CERTIFICATE_EXTENSION_TAILS = frozenset(ext[-4:] for ext in CERTIFICATE_EXTENSIONS)
+
     # Keywords that suggest a file is a certificate (Spanish)
     CERTIFICATE_KEYWORDS = [
         'certificado', 'certifica', 'constancia', 'personería',
@@ -40,12 +175,28 @@ class FolderScanner:
         'ltda', 'limitada', 'empresa', 'corporación', 'corp'
     ]
 
-    def __init__(self, base_path: str):
+    # Company keywords as whole words, dots removed ('s.a.' -> 'sa')
+    COMPANY_TOKENS = frozenset(keyword.replace('.', '') for keyword in COMPANY_KEYWORDS)
+
+    # Institutions recognized in certificate filenames
+    INSTITUTIONS = ['BPS', 'MSP', 'ABITAB', 'DGI', 'ASSE', 'ANTEL', 'UTE', 'OSE']
+
+    # Matched (lowercase) institution -> canonical name, so records share
+    # the INSTITUTIONS strings instead of allocating one per file
+    INSTITUTION_NAMES = {inst.lower(): inst for inst in INSTITUTIONS}
+
+    # Bump when the filename classification logic changes, so scan caches
+    # written by older rules are discarded
+    SCAN_CACHE_VERSION = 1
+
+    def __init__(self, base_path: str, cache_file: Optional[str] = None):
         """
         Initialize scanner with base directory containing customer folders.
 
         Args:
             base_path: Path to directory containing customer folders
+            cache_file: Optional JSON file caching scan results per folder;
+                        unchanged folders are not rescanned
         """
         self.base_path = Path(base_path)
         if not self.base_path.exists():
@@ -53,12 +204,54 @@ class FolderScanner:
         if not self.base_path.is_dir():
             raise ValueError(f"Base path is not a directory: {base_path}")
 
+        self.cache_file = Path(cache_file) if cache_file else None
+
+        # Specialized check for the fixed certificate keyword list
+        self._has_certificate_keyword = _build_keyword_predicate(self.CERTIFICATE_KEYWORDS)
+
+        # With Hyperscan, ERROR prefix, institutions and "has a date" are
+        # matched in one SIMD scan; the date regex then only runs on names
+        # that contain a date
+        self._hs_db = None
+        if HYPERSCAN_AVAILABLE:
+            expressions = [
+                rb'^error',
+                rb'\d{4}[-_]\d{2}[-_]\d{2}|\d{2}[-_]\d{2}[-_]\d{4}|\d{8}',
+            ] + [inst.lower().encode('utf-8') for inst in self.INSTITUTIONS]
+            # Only whether each pattern occurs matters, not where
+            flags = [hyperscan.HS_FLAG_SINGLEMATCH] * len(expressions)
+
+            self._hs_db = hyperscan.Database()
+            self._hs_db.compile(
+                expressions=expressions,
+                ids=list(range(len(expressions))),
+                elements=len(expressions),
+                flags=flags
+            )
+            # Scratch space can't be shared by concurrent scans (thread pool)
+            self._hs_local = threading.local()
+
     def _generate_customer_id(self, folder_name: str) -> str:
         """Generate unique customer ID from folder name"""
         # Use hash of folder name for consistent ID generation
-        return hashlib.md5(folder_name.encode()).hexdigest()[:12]
+        return hashlib.blake2b(folder_name.encode('utf-8'), digest_size=6).hexdigest()
+
+    @classmethod
+    def has_company_keyword(cls, name: str) -> bool:
+        """
+        Check if a customer name contains a company keyword as a whole word
+        (so 'sa' does not match 'casa'; 's.a.' and 'sa' are equivalent).
 
-    def _detect_customer_type(self, name: str, folder_path: Path) -> CustomerType:
+        Args:
+            name: Customer name
+
+        Returns:
+            True if any COMPANY_TOKENS word appears in the name
+        """
+        tokens = {token.replace('.', '') for token in _WORD_RE.findall(name.lower())}
+        return not tokens.isdisjoint(cls.COMPANY_TOKENS)
+
+    def _detect_customer_type(self, name: str, folder_path: Union[str, Path]) -> CustomerType:
         """
         Detect if customer is a person or company based on name and content.
 
@@ -69,12 +262,9 @@ class FolderScanner:
         Returns:
             CustomerType.PERSON or CustomerType.COMPANY
         """
-        name_lower = name.lower()
-
-        # Check for company keywords in name
-        for keyword in self.COMPANY_KEYWORDS:
-            if keyword in name_lower:
-                return CustomerType.COMPANY
+        # Check for company keywords as whole words in name
+        if self.has_company_keyword(name):
+            return CustomerType.COMPANY
 
         # Check if name has multiple words (companies often have longer names)
         words = name.split()
@@ -84,58 +274,88 @@ class FolderScanner:
         # Default to PERSON if uncertain
         return CustomerType.PERSON
 
-    def _is_certificate_file(self, file_path: Path) -> bool:
+    def _is_certificate_file(self, name_lower: str) -> bool:
         """
         Check if a file is likely a certificate.
 
         Args:
-            file_path: Path to file
+            name_lower: Lowercased name of the file
 
         Returns:
             True if file appears to be a certificate
         """
         # Check extension
-        if file_path.suffix.lower() not in self.CERTIFICATE_EXTENSIONS:
+        extension = '.' + name_lower.rsplit('.', 1)[-1]
+        if extension not in self.CERTIFICATE_EXTENSIONS:
             return False
 
         # Check filename for certificate keywords
-        filename_lower = file_path.name.lower()
-        return any(keyword in filename_lower for keyword in self.CERTIFICATE_KEYWORDS)
+        return self._has_certificate_keyword(name_lower)
 
-    def _extract_error_status(self, filename: str) -> Tuple[bool, CertificateStatus]:
+    def _classify_filename(self, name_lower: str) -> Tuple[bool, Optional[str], Optional[datetime]]:
         """
-        Check if filename starts with ERROR prefix.
+        Extract ERROR prefix, institution and date from a filename.
 
         Args:
-            filename: Name of the file
+            name_lower: Lowercased name of the file
 
         Returns:
-            Tuple of (has_error_prefix, status)
+            Tuple of (has_error_prefix, institution or None, date or None)
         """
-        has_error = filename.upper().startswith('ERROR')
-        status = CertificateStatus.ERROR if has_error else CertificateStatus.OK
-        return has_error, status
+        if self._hs_db is not None:
+            return self._classify_filename_hyperscan(name_lower)
+
+        return (
+            name_lower.startswith('error'),
+            self._match_institution(name_lower),
+            _date_from_filename(name_lower)
+        )
 
-    def _extract_institution(self, filename: str) -> Optional[str]:
+    def _match_institution(self, name_lower: str) -> Optional[str]:
         """
-        Extract institution name from filename if present.
-        Common institutions: BPS, MSP, Abitab, DGI, etc.
+        First institution, in INSTITUTIONS order, whose name occurs in the
+        filename. Priority is by list order, not position in the name, so
+        e.g. 'jose_perez_bps' is BPS even though 'ose' appears first.
 
         Args:
-            filename: Name of the file
+            name_lower: Lowercased name of the file
 
         Returns:
-            Institution name or None
+            Institution name (uppercase) or None
         """
-        filename_upper = filename.upper()
+        for inst_lower, inst in self.INSTITUTION_NAMES.items():
+            if inst_lower in name_lower:
+                return inst
+        return None
 
-        institutions = ['BPS', 'MSP', 'ABITAB', 'DGI', 'ASSE', 'ANTEL', 'UTE', 'OSE']
+    def _classify_filename_hyperscan(self, name_lower: str) -> Tuple[bool, Optional[str], Optional[datetime]]:
+        """
+        Hyperscan variant of _classify_filename (same results).
 
-        for inst in institutions:
-            if inst in filename_upper:
-                return inst
+        Args:
+            name_lower: Lowercased name of the file
 
-        return None
+        Returns:
+            Tuple of (has_error_prefix, institution or None, date or None)
+        """
+        scratch = getattr(self._hs_local, 'scratch', None)
+        if scratch is None:
+            scratch = self._hs_local.scratch = hyperscan.Scratch(self._hs_db)
+
+        state = [False, None, False]
+        self._hs_db.scan(
+            name_lower.encode('utf-8'),
+            match_event_handler=_on_hyperscan_match,
+            context=state,
+            scratch=scratch
+        )
+
+        has_error, inst_index, has_date = state
+        institution = self.INSTITUTIONS[inst_index] if inst_index is not None else None
+
+        date = _date_from_filename(name_lower) if has_date else None
+
+        return has_error, institution, date
 
     def _extract_date_from_filename(self, filename: str) -> Optional[datetime]:
         """
@@ -148,84 +368,138 @@ class FolderScanner:
         Returns:
             Extracted datetime or None
         """
-        # Pattern: YYYY-MM-DD or YYYY_MM_DD
-        pattern1 = r'(\d{4})[-_](\d{2})[-_](\d{2})'
-        match = re.search(pattern1, filename)
-        if match:
-            try:
-                year, month, day = match.groups()
-                return datetime(int(year), int(month), int(day))
-            except ValueError:
-                pass
-
-        # Pattern: DD-MM-YYYY or DD_MM_YYYY
-        pattern2 = r'(\d{2})[-_](\d{2})[-_](\d{4})'
-        match = re.search(pattern2, filename)
-        if match:
-            try:
-                day, month, year = match.groups()
-                return datetime(int(year), int(month), int(day))
-            except ValueError:
-                pass
-
-        # Pattern: YYYYMMDD
-        pattern3 = r'(\d{8})'
-        match = re.search(pattern3, filename)
-        if match:
-            try:
-                date_str = match.group(1)
-                return datetime.strptime(date_str, '%Y%m%d')
-            except ValueError:
-                pass
+        return _date_from_filename(filename)
 
-        return None
+    def _scan_cache_key(self) -> str:
+        """
+        Fingerprint of the rules that produced cached certificate records:
+        SCAN_CACHE_VERSION plus the extension, keyword and institution lists.
+        """
+        config = [
+            self.SCAN_CACHE_VERSION,
+            sorted(self.CERTIFICATE_EXTENSIONS),
+            self.CERTIFICATE_KEYWORDS,
+            self.INSTITUTIONS
+        ]
+        return hashlib.blake2b(json.dumps(config).encode('utf-8'), digest_size=8).hexdigest()
+
+    def _load_scan_cache(self) -> Dict[str, dict]:
+        """
+        Load cached scan results.
+        A cache written with different classification rules is ignored.
+
+        Returns:
+            Dict of folder_path -> {'dirs': {path: mtime_ns}, 'certificates': [...]}
+        """
+        if self.cache_file is None or not self.cache_file.exists():
+            return {}
+
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read scan cache {self.cache_file}: {e}")
+            return {}
+
+        if not isinstance(cache, dict) or cache.get('key') != self._scan_cache_key():
+            return {}
+        return cache.get('folders', {})
+
+    def _save_scan_cache(self, cache: Dict[str, dict]) -> None:
+        """Persist scan results for the next scan_all_customers()"""
+        data = {'key': self._scan_cache_key(), 'folders': cache}
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"Warning: Could not write scan cache {self.cache_file}: {e}")
+
+    @staticmethod
+    def _is_cache_fresh(dir_mtimes: Dict[str, int]) -> bool:
+        """
+        Check whether a cached folder scan is still valid.
 
-    def _generate_certificate_id(self, customer_id: str, filename: str) -> str:
-        """Generate unique certificate ID"""
-        combined = f"{customer_id}_{filename}"
-        return hashlib.md5(combined.encode()).hexdigest()[:16]
+        Certificate records only depend on file names and paths, and adding,
+        removing or renaming an entry updates its parent directory's mtime.
+        So the scan is still valid if no directory in the folder changed.
 
-    def scan_customer_folder(self, folder_path: Path, customer: Customer) -> List[CertificateRecord]:
+        Args:
+            dir_mtimes: Directory path -> st_mtime_ns recorded at scan time
+
+        Returns:
+            True if every directory still has its recorded mtime
+        """
+        try:
+            return all(os.stat(path).st_mtime_ns == mtime for path, mtime in dir_mtimes.items())
+        except OSError:
+            return False
+
+    def scan_customer_folder(
+        self,
+        folder_path: Union[str, Path],
+        customer: Customer,
+        entries: Optional[List[os.DirEntry]] = None,
+        dir_mtimes: Optional[Dict[str, int]] = None
+    ) -> Iterator[CertificateRecord]:
         """
         Scan a customer folder for certificates.
 
         Args:
             folder_path: Path to customer folder
             customer: Customer object
+            entries: First-level scandir entries of folder_path, if already listed
+            dir_mtimes: If given, receives the mtime of each subdirectory scanned
 
-        Returns:
-            List of CertificateRecord objects
+        Yields:
+            CertificateRecord objects as they are found
         """
-        certificates = []
+        # Certificate IDs hash "<customer_id>_<filename>"; hash the shared
+        # prefix once and copy the state per file
+        id_prefix = hashlib.blake2b(f"{customer.customer_id}_".encode('utf-8'), digest_size=8)
+
+        if entries is None:
+            with os.scandir(folder_path) as it:
+                entries = list(it)
+
+        # Bind per-file lookups to locals once; this loop runs for every file
+        customer_id = customer.customer_id
+        extension_tails = self.CERTIFICATE_EXTENSION_TAILS
+        is_certificate_file = self._is_certificate_file
+        classify_filename = self._classify_filename
 
         # Recursively scan folder for certificate files
-        for file_path in folder_path.rglob('*'):
-            if not file_path.is_file():
+        for entry in _iter_files(entries, dir_mtimes):
+            filename = entry.name
+
+            # Reject most non-certificates before lowercasing the whole name
+            if filename[-4:].lower() not in extension_tails:
                 continue
 
-            if not self._is_certificate_file(file_path):
+            name_lower = filename.lower()
+            if not is_certificate_file(name_lower):
                 continue
 
-            filename = file_path.name
-            has_error, status = self._extract_error_status(filename)
-            institution = self._extract_institution(filename)
-            date = self._extract_date_from_filename(filename)
+            file_path = entry.path
+            id_hash = id_prefix.copy()
+            id_hash.update(filename.encode('utf-8'))
+
+            has_error, institution, date = classify_filename(name_lower)
+            status = CertificateStatus.ERROR if has_error else CertificateStatus.OK
 
             certificate = CertificateRecord(
-                certificate_id=self._generate_certificate_id(customer.customer_id, filename),
-                customer_id=customer.customer_id,
+                certificate_id=id_hash.hexdigest(),
+                customer_id=customer_id,
                 institution=institution,
                 date=date,
                 status=status,
-                source_files=[str(file_path)],
+                source_files=[file_path],
                 filename=filename,
-                file_path=str(file_path),
+                file_path=file_path,
                 has_error_prefix=has_error
             )
 
-            certificates.append(certificate)
-
-        return certificates
+            yield certificate
 
     def scan_all_customers(self) -> CustomerRegistry:
         """
@@ -235,34 +509,98 @@ class FolderScanner:
             CustomerRegistry containing all customers and certificates
         """
         registry = CustomerRegistry()
+        # (customer, folder_path, first-level entries, dir_mtimes) per folder;
+        # entries and dir_mtimes are None when the cached scan is reused, and
+        # dir_mtimes alone is None for folders that could not be listed
+        customer_folders = []
 
-        # Iterate through immediate subdirectories (each = one customer)
-        for folder_path in self.base_path.iterdir():
-            if not folder_path.is_dir():
-                continue
-
-            # Skip hidden folders
-            if folder_path.name.startswith('.'):
-                continue
-
-            # Create Customer object
-            customer_name = folder_path.name
-            customer_id = self._generate_customer_id(customer_name)
-            customer_type = self._detect_customer_type(customer_name, folder_path)
+        # Folders whose directories are unchanged since the last scan reuse
+        # the cached records and are not listed or classified again
+        cache = self._load_scan_cache()
+        new_cache = {}
 
-            customer = Customer(
-                customer_id=customer_id,
-                name=customer_name,
-                customer_type=customer_type,
-                folder_path=str(folder_path)
-            )
-
-            registry.add_customer(customer)
-
-            # Scan for certificates in this customer's folder
-            certificates = self.scan_customer_folder(folder_path, customer)
-            for cert in certificates:
-                registry.add_certificate(cert)
+        # Iterate through immediate subdirectories (each = one customer)
+        with os.scandir(self.base_path) as it:
+            for folder_entry in it:
+                # Skip hidden folders
+                if folder_entry.name.startswith('.'):
+                    continue
+
+                # Answered from the directory listing; only symlinked
+                # customer folders need a stat() to resolve
+                if not folder_entry.is_dir():
+                    continue
+
+                # Plain path string; no Path objects needed while scanning
+                folder_path = folder_entry.path
+
+                # Create Customer object
+                customer_name = folder_entry.name
+                customer_id = self._generate_customer_id(customer_name)
+                customer_type = self._detect_customer_type(customer_name, folder_path)
+
+                customer = Customer(
+                    customer_id=customer_id,
+                    name=customer_name,
+                    customer_type=customer_type,
+                    folder_path=folder_path
+                )
+
+                cached = cache.get(folder_path)
+                if cached is not None and self._is_cache_fresh(cached['dirs']):
+                    new_cache[folder_path] = cached
+                    customer_folders.append((customer, folder_path, None, None))
+                    continue
+
+                # Subdirectory mtimes are added while the folder is scanned
+                dir_mtimes = {folder_path: folder_entry.stat().st_mtime_ns}
+
+                # List the folder once; the entries are reused for scanning
+                try:
+                    with os.scandir(folder_entry.path) as children:
+                        entries = list(children)
+                except PermissionError as e:
+                    # Keep the customer without certificates and don't cache
+                    # the folder, so it is listed again next time
+                    print(f"Warning: Could not read customer folder {folder_path}: {e}")
+                    entries, dir_mtimes = [], None
+
+                customer_folders.append((customer, folder_path, entries, dir_mtimes))
+
+        # Customer folders are disjoint subtrees; scan them concurrently
+        # (I/O-bound) and add results to the registry on this thread in order.
+        # Each worker drains its folder's generator.
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    list,
+                    self.scan_customer_folder(folder_path, customer, entries, dir_mtimes)
+                ) if entries is not None else None
+                for customer, folder_path, entries, dir_mtimes in customer_folders
+            ]
+
+            for (customer, folder_path, _, dir_mtimes), future in zip(customer_folders, futures):
+                registry.add_customer(customer)
+
+                if future is None:
+                    certificates = [
+                        CertificateRecord(**cert)
+                        for cert in new_cache[folder_path]['certificates']
+                    ]
+                else:
+                    certificates = future.result()
+                    if dir_mtimes is not None:
+                        new_cache[folder_path] = {
+                            'dirs': dir_mtimes,
+                            'certificates': [cert.model_dump(mode='json') for cert in certificates]
+                        }
+
+                # Certificates found in this customer's folder
+                registry.extend_certificates(certificates)
+
+        if self.cache_file is not None:
+            self._save_scan_cache(new_cache)
 
         return registry
 
@@ -276,8 +614,9 @@ class FolderScanner:
         Returns:
             Dictionary with summary statistics
         """
-        total_persons = sum(1 for c in registry.customers if c.customer_type == CustomerType.PERSON)
-        total_companies = sum(1 for c in registry.customers if c.customer_type == CustomerType.COMPANY)
+        type_counts = Counter(c.customer_type for c in registry.customers)
+        total_persons = type_counts.get(CustomerType.PERSON, 0)
+        total_companies = type_counts.get(CustomerType.COMPANY, 0)
         total_error_certs = len(registry.get_error_certificates())
 
         return {
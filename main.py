@@ -18,6 +18,7 @@ Usage:
 
 import argparse
 import sys
+from operator import attrgetter, itemgetter
 from pathlib import Path
 
 from folder_scanner import FolderScanner
@@ -50,7 +51,8 @@ def scan_customers(base_path: str):
     """Scan customer folders and save registry"""
     print_header("SCANNING CUSTOMER FOLDERS")
 
-    scanner = FolderScanner(base_path)
+    storage = StorageManager()
+    scanner = FolderScanner(base_path, cache_file=str(storage.storage_dir / "scan_cache.json"))
     print(f"\nScanning: {base_path}")
 
     registry = scanner.scan_all_customers()
@@ -65,7 +67,6 @@ def scan_customers(base_path: str):
     print(f"Error Certificates: {summary['total_error_certificates']}")
 
     # Save registry
-    storage = StorageManager()
     storage.save_registry(registry)
     print(f"\n✓ Registry saved to: {storage.registry_file}")
 
@@ -106,7 +107,7 @@ def show_statistics():
 
     print_section("Certificates by Institution")
     if stats['institutions']:
-        for inst, count in sorted(stats['institutions'].items(), key=lambda x: x[1], reverse=True):
+        for inst, count in sorted(stats['institutions'].items(), key=itemgetter(1), reverse=True):
             print(f"  {inst}: {count}")
     else:
         print("  No institution data available")
@@ -171,7 +172,7 @@ def show_customer_details(customer_name: str):
 
     if summary['certificates_by_institution']:
         print(f"\n  By Institution:")
-        for inst, count in sorted(summary['certificates_by_institution'].items(), key=lambda x: x[1], reverse=True):
+        for inst, count in sorted(summary['certificates_by_institution'].items(), key=itemgetter(1), reverse=True):
             print(f"    {inst}: {count}")
 
     # Recent certificates
@@ -209,8 +210,8 @@ def list_customers():
 
     print(f"\nTotal: {registry.total_customers} customers\n")
 
-    for customer in sorted(registry.customers, key=lambda c: c.name):
-        cert_count = len(registry.get_customer_certificates(customer.customer_id))
+    for customer in sorted(registry.customers, key=attrgetter('name')):
+        cert_count = registry.count_customer_certificates(customer.customer_id)
         type_marker = "👤" if customer.customer_type == "PERSON" else "🏢"
         print(f"  {type_marker} {customer.name} ({cert_count} certificates)")
 
@@ -1,11 +1,35 @@
+# 1. Certificate type (LEGAL choice)
+_CERTIFICATE_TYPE = "certificado_hechos"
+
+# 3. Conditions (none apply to an Acta)
+_CONDITION_KEYS = (
+    "otorgante_no_sabe_o_no_puede_firmar",
+)
+
+# 4. Global fields (Art. 255), all present
+_GLOBAL_FIELD_KEYS = (
+    "nombre_solicitante",
+    "destinatario",
+    "lugar_expedicion",
+    "fecha_expedicion",
+    "firma_y_sello_escribano",
+    "constancia_cumplimiento_legal",
+)
+
+
 def map_acta_to_engine_input(acta_json: dict) -> dict:
     """
     Converts extracted Acta JSON into the input format
     expected by decision_engine.py
     """
+    other_fields = acta_json.get("other_fields", {})
+
+    has_presidente = bool(other_fields.get("presidente_asamblea"))
 
-    # 1. Certificate type (LEGAL choice)
-    certificate_type = "certificado_hechos"
+    # Usually already a string; only coerce other JSON values
+    modificacion_legal = other_fields.get("modificacion_legal", "")
+    if not isinstance(modificacion_legal, str):
+        modificacion_legal = str(modificacion_legal)
 
     # 2. Facts (presence-based, NOT validity)
     facts = {
@@ -19,41 +43,20 @@ def map_acta_to_engine_input(acta_json: dict) -> dict:
 
         "existencia_persona_juridica": bool(acta_json.get("denominacion")),
 
-        "designacion_autoridades": bool(
-            acta_json.get("other_fields", {}).get("presidente_asamblea")
-        ),
+        "designacion_autoridades": has_presidente,
 
-        "cargo_vigente": bool(
-            acta_json.get("other_fields", {}).get("presidente_asamblea")
-        ),
+        "cargo_vigente": has_presidente,
 
-        "cumplimiento_ley_18930": "18930" in str(
-            acta_json.get("other_fields", {}).get("modificacion_legal", "")
-        ),
+        "cumplimiento_ley_18930": "18930" in modificacion_legal,
 
         "cumplimiento_ley_17904": False,
 
         "beneficiario_final_declarado": False
     }
 
-    # 3. Conditions
-    conditions = {
-        "otorgante_no_sabe_o_no_puede_firmar": False
-    }
-
-    # 4. Global fields (Art. 255)
-    global_fields = {
-        "nombre_solicitante": True,
-        "destinatario": True,
-        "lugar_expedicion": True,
-        "fecha_expedicion": True,
-        "firma_y_sello_escribano": True,
-        "constancia_cumplimiento_legal": True
-    }
-
     return {
-        "certificate_type": certificate_type,
+        "certificate_type": _CERTIFICATE_TYPE,
         "facts": facts,
-        "conditions": conditions,
-        "global_fields": global_fields
+        "conditions": {key: False for key in _CONDITION_KEYS},
+        "global_fields": {key: True for key in _GLOBAL_FIELD_KEYS}
     }
@@ -4,58 +4,104 @@ Indexes file metadata from downloaded Drive files.
 """
 
 import json
+import os
+import sys
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, is_dataclass
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 from file_detector import FileDetector, FileType
+from folder_scanner import iter_files
 
 
-class FileMetadata:
-    """Represents metadata for a single file"""
+def _json_default(obj):
+    """Serialize dataclasses (FileMetadata) for the json fallback"""
+    if is_dataclass(obj):
+        return asdict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _write_json(path: Path, data: Dict) -> None:
+    """
+    Write data as indented UTF-8 JSON (orjson when installed).
+    Dataclasses are serialized directly, without to_dict() copies.
+    """
+    if ORJSON_AVAILABLE:
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False, default=_json_default)
+
+
+def _file_times(stats: os.stat_result) -> Tuple[str, str]:
+    """
+    Format (ctime, mtime) as local ISO-8601 strings.
+    Files that were written once have equal times; format those only once.
+    """
+    created = datetime.fromtimestamp(stats.st_ctime).isoformat()
+    if stats.st_mtime == stats.st_ctime:
+        return created, created
+    return created, datetime.fromtimestamp(stats.st_mtime).isoformat()
 
-    def __init__(
-        self,
-        file_id: Optional[str],
-        file_name: str,
-        local_path: str,
-        file_type: FileType,
-        mime_type: Optional[str],
-        size_bytes: int,
-        created_time: Optional[str] = None,
-        modified_time: Optional[str] = None,
-        drive_created_time: Optional[str] = None,
-        drive_modified_time: Optional[str] = None
-    ):
-        self.file_id = file_id
-        self.file_name = file_name
-        self.local_path = local_path
-        self.file_type = file_type
-        self.mime_type = mime_type
-        self.size_bytes = size_bytes
-        self.size_mb = round(size_bytes / (1024 * 1024), 2) if size_bytes else 0
-        self.created_time = created_time
-        self.modified_time = modified_time
-        self.drive_created_time = drive_created_time
-        self.drive_modified_time = drive_modified_time
-        self.indexed_at = datetime.now().isoformat()
+
+def _json_line(data: Dict) -> bytes:
+    """Encode data as one compact UTF-8 JSON line (orjson when installed)"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data) + b"\n"
+    return (json.dumps(data, ensure_ascii=False, default=_json_default) + "\n").encode('utf-8')
+
+
+def _read_json(path: Path) -> Dict:
+    """Read a JSON file (orjson when installed)"""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(path.read_bytes())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@dataclass(slots=True)
+class FileMetadata:
+    """Represents metadata for a single file (slotted: no per-instance dict)"""
+
+    file_id: Optional[str]
+    file_name: str
+    local_path: str
+    file_type: FileType
+    mime_type: Optional[str]
+    size_bytes: int
+    created_time: Optional[str] = None
+    modified_time: Optional[str] = None
+    drive_created_time: Optional[str] = None
+    drive_modified_time: Optional[str] = None
+    indexed_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    def __post_init__(self):
+        # Few distinct values across many files; share one string object
+        # per value (FileType members are shared already)
+        if type(self.file_type) is str:
+            self.file_type = sys.intern(self.file_type)
+        if type(self.mime_type) is str:
+            self.mime_type = sys.intern(self.mime_type)
+
+    @property
+    def size_mb(self) -> float:
+        """Size in megabytes (derived from size_bytes on access)"""
+        return round(self.size_bytes / (1024 * 1024), 2) if self.size_bytes else 0
 
     def to_dict(self) -> Dict:
         """Convert to dictionary"""
-        return {
-            'file_id': self.file_id,
-            'file_name': self.file_name,
-            'local_path': self.local_path,
-            'file_type': self.file_type,
-            'mime_type': self.mime_type,
-            'size_bytes': self.size_bytes,
-            'size_mb': self.size_mb,
-            'created_time': self.created_time,
-            'modified_time': self.modified_time,
-            'drive_created_time': self.drive_created_time,
-            'drive_modified_time': self.drive_modified_time,
-            'indexed_at': self.indexed_at
-        }
+        data = asdict(self)
+        data['size_mb'] = self.size_mb
+        return data
 
 
 class MetadataIndex:
@@ -75,6 +121,14 @@ class MetadataIndex:
         self.index_file.parent.mkdir(parents=True, exist_ok=True)
         self.detector = FileDetector()
         self.metadata: Dict[str, List[FileMetadata]] = {}
+        self._reset_aggregates()
+
+    def _reset_aggregates(self):
+        """Reset the running totals kept in step with add_file()"""
+        self._total_files = 0
+        self._total_bytes = 0
+        self._type_counts: Counter = Counter()
+        self._customer_bytes: Dict[str, int] = {}
 
     def add_file(
         self,
@@ -90,9 +144,33 @@ class MetadataIndex:
         """
         if customer_name not in self.metadata:
             self.metadata[customer_name] = []
+            self._customer_bytes[customer_name] = 0
 
         self.metadata[customer_name].append(file_metadata)
 
+        # Keep statistics up to date so get_statistics() needn't rescan
+        self._total_files += 1
+        self._total_bytes += file_metadata.size_bytes
+        self._customer_bytes[customer_name] += file_metadata.size_bytes
+        self._type_counts[str(file_metadata.file_type)] += 1
+
+    def _read_header(self, path: str) -> Optional[bytes]:
+        """
+        Read the bytes used for content sniffing, once per file.
+
+        Returns:
+            File header, or None if libmagic is unavailable or the read
+            failed (the detector then reports the error and falls back)
+        """
+        if not self.detector.magic_available:
+            return None
+
+        try:
+            with open(path, 'rb') as fh:
+                return fh.read(self.detector.MAGIC_HEADER_BYTES)
+        except OSError:
+            return None
+
     def index_downloaded_files(self, download_dir: Path, customer_name: str) -> int:
         """
         Index all files in a customer's download directory.
@@ -109,28 +187,28 @@ class MetadataIndex:
 
         count = 0
 
-        for file_path in download_dir.rglob('*'):
-            if not file_path.is_file():
-                continue
+        for entry in iter_files(download_dir):
+            # The entry is known to exist, so the detector needn't check
+            # or reopen the file
+            header = self._read_header(entry.path)
 
-            # Detect file type
-            file_type = self.detector.detect_file_type(file_path)
-            mime_type = self.detector.detect_from_content(file_path) or \
-                        self.detector.detect_from_extension(file_path)
+            # Detect file type (and the MIME type it came from) in one pass
+            file_type, mime_type = self.detector.detect_file_type_with_mime(entry.path, header)
 
             # Get file stats
-            stats = file_path.stat()
+            stats = entry.stat()
+            created_time, modified_time = _file_times(stats)
 
             # Create metadata
             metadata = FileMetadata(
                 file_id=None,  # No Drive ID for local files
-                file_name=file_path.name,
-                local_path=str(file_path),
+                file_name=entry.name,
+                local_path=entry.path,
                 file_type=file_type,
                 mime_type=mime_type,
                 size_bytes=stats.st_size,
-                created_time=datetime.fromtimestamp(stats.st_ctime).isoformat(),
-                modified_time=datetime.fromtimestamp(stats.st_mtime).isoformat()
+                created_time=created_time,
+                modified_time=modified_time
             )
 
             self.add_file(customer_name, metadata)
@@ -138,6 +216,48 @@ class MetadataIndex:
 
         return count
 
+    def _drive_file_metadata(self, file_meta: Dict) -> FileMetadata:
+        """
+        Build metadata for one downloaded Drive file (runs in worker threads).
+
+        Args:
+            file_meta: File metadata dictionary from DriveManager
+
+        Returns:
+            FileMetadata object
+        """
+        local_path = file_meta['local_path']
+
+        # One stat() both checks the file exists and gets its times
+        try:
+            local_stats = os.stat(local_path)
+        except OSError:
+            local_stats = None
+
+        if local_stats is not None:
+            # Detect file type from local file
+            file_type, _ = self.detector.detect_file_type_with_mime(
+                local_path, self._read_header(local_path)
+            )
+            created_time, modified_time = _file_times(local_stats)
+        else:
+            file_type = FileType.UNKNOWN
+            created_time = None
+            modified_time = None
+
+        return FileMetadata(
+            file_id=file_meta.get('file_id'),
+            file_name=file_meta['file_name'],
+            local_path=local_path,
+            file_type=file_type,
+            mime_type=file_meta.get('mime_type'),
+            size_bytes=int(file_meta.get('size', 0)),
+            created_time=created_time,
+            modified_time=modified_time,
+            drive_created_time=file_meta.get('created_time'),
+            drive_modified_time=file_meta.get('modified_time')
+        )
+
     def index_from_drive_stats(self, drive_stats: List[Dict]) -> int:
         """
         Index files from Drive download statistics.
@@ -148,58 +268,35 @@ class MetadataIndex:
         Returns:
             Total number of files indexed
         """
-        total = 0
-
-        for stats in drive_stats:
-            customer_name = stats['folder_name']
-
-            for file_meta in stats.get('file_metadata', []):
-                # Detect file type from local file
-                local_path = Path(file_meta['local_path'])
-                file_type = self.detector.detect_file_type(local_path)
-
-                # Get local file stats
-                if local_path.exists():
-                    local_stats = local_path.stat()
-                    created_time = datetime.fromtimestamp(local_stats.st_ctime).isoformat()
-                    modified_time = datetime.fromtimestamp(local_stats.st_mtime).isoformat()
-                else:
-                    created_time = None
-                    modified_time = None
-
-                metadata = FileMetadata(
-                    file_id=file_meta.get('file_id'),
-                    file_name=file_meta['file_name'],
-                    local_path=file_meta['local_path'],
-                    file_type=file_type,
-                    mime_type=file_meta.get('mime_type'),
-                    size_bytes=int(file_meta.get('size', 0)),
-                    created_time=created_time,
-                    modified_time=modified_time,
-                    drive_created_time=file_meta.get('created_time'),
-                    drive_modified_time=file_meta.get('modified_time')
-                )
-
-                self.add_file(customer_name, metadata)
-                total += 1
-
-        return total
+        jobs = [
+            (stats['folder_name'], file_meta)
+            for stats in drive_stats
+            for file_meta in stats.get('file_metadata', [])
+        ]
+
+        # stat() and header reads are I/O-bound (downloads may sit on a
+        # network mount), so overlap them across threads
+        max_workers = min(32, (os.cpu_count() or 1) * 4)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(self._drive_file_metadata, [file_meta for _, file_meta in jobs]))
+
+        # Add to the index on this thread, in Drive order
+        for (customer_name, _), metadata in zip(jobs, results):
+            self.add_file(customer_name, metadata)
+
+        return len(jobs)
 
     def save(self):
         """Save metadata index to JSON file"""
         data = {
             'indexed_at': datetime.now().isoformat(),
             'total_customers': len(self.metadata),
-            'total_files': sum(len(files) for files in self.metadata.values()),
-            'customers': {}
+            'total_files': self._total_files,
+            # FileMetadata dataclasses are serialized as-is
+            'customers': self.metadata
         }
 
-        # Convert metadata to dictionaries
-        for customer_name, files in self.metadata.items():
-            data['customers'][customer_name] = [f.to_dict() for f in files]
-
-        with open(self.index_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        _write_json(self.index_file, data)
 
     def load(self) -> bool:
         """
@@ -212,15 +309,18 @@ class MetadataIndex:
             return False
 
         try:
-            with open(self.index_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            data = _read_json(self.index_file)
 
             self.metadata = {}
+            self._reset_aggregates()
 
             for customer_name, files in data.get('customers', {}).items():
-                self.metadata[customer_name] = [
-                    FileMetadata(**file_data) for file_data in files
-                ]
+                for file_data in files:
+                    # size_mb is derived from size_bytes (older indexes stored it)
+                    self.add_file(
+                        customer_name,
+                        FileMetadata(**{k: v for k, v in file_data.items() if k != 'size_mb'})
+                    )
 
             return True
 
@@ -240,32 +340,21 @@ class MetadataIndex:
     def get_statistics(self) -> Dict:
         """
         Generate statistics about indexed files.
+        Reads the running totals kept by add_file(), so no file is rescanned.
 
         Returns:
             Dictionary with statistics
         """
-        total_files = 0
-        total_size = 0
-        type_counts = {}
-
-        for files in self.metadata.values():
-            for file in files:
-                total_files += 1
-                total_size += file.size_bytes
-
-                file_type = str(file.file_type)
-                type_counts[file_type] = type_counts.get(file_type, 0) + 1
-
         return {
             'total_customers': len(self.metadata),
-            'total_files': total_files,
-            'total_size_mb': round(total_size / (1024 * 1024), 2),
-            'files_by_type': type_counts,
+            'total_files': self._total_files,
+            'total_size_mb': round(self._total_bytes / (1024 * 1024), 2),
+            'files_by_type': dict(self._type_counts),
             'customers_with_files': [
                 {
                     'name': name,
                     'file_count': len(files),
-                    'total_size_mb': round(sum(f.size_bytes for f in files) / (1024 * 1024), 2)
+                    'total_size_mb': round(self._customer_bytes[name] / (1024 * 1024), 2)
                 }
                 for name, files in self.metadata.items()
             ]
@@ -291,33 +380,33 @@ Files by Type:
 
     def export_report(self, output_file: str):
         """
-        Export detailed report as JSON.
+        Export detailed report as NDJSON (one JSON object per line).
+        The first line holds the summary, then one line per customer, so
+        only one customer's files are encoded at a time.
 
         Args:
             output_file: Path to output file
         """
         stats = self.get_statistics()
 
-        report = {
+        header = {
             'generated_at': datetime.now().isoformat(),
             'summary': {
                 'total_customers': stats['total_customers'],
                 'total_files': stats['total_files'],
                 'total_size_mb': stats['total_size_mb']
             },
-            'files_by_type': stats['files_by_type'],
-            'customers': []
+            'files_by_type': stats['files_by_type']
         }
 
-        # Add per-customer details
-        for customer_name, files in self.metadata.items():
-            customer_info = {
-                'name': customer_name,
-                'total_files': len(files),
-                'total_size_mb': round(sum(f.size_bytes for f in files) / (1024 * 1024), 2),
-                'files': [f.to_dict() for f in files]
-            }
-            report['customers'].append(customer_info)
-
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        with open(output_file, 'wb') as f:
+            f.write(_json_line(header))
+
+            # Add per-customer details
+            for customer_name, files in self.metadata.items():
+                f.write(_json_line({
+                    'name': customer_name,
+                    'total_files': len(files),
+                    'total_size_mb': round(self._customer_bytes[customer_name] / (1024 * 1024), 2),
+                    'files': files
+                }))
@@ -4,10 +4,11 @@ Customer and Certificate data structures for the notary document system.
 Milestone 2: Added Drive metadata support.
 """
 
+import sys
 from datetime import datetime
 from enum import Enum
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from typing import Any, Dict, Iterable, List, Optional
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
 
 
 class CustomerType(str, Enum):
@@ -62,6 +63,17 @@ class CertificateRecord(BaseModel):
     class Config:
         use_enum_values = True
 
+    @field_validator('institution')
+    @classmethod
+    def _intern_institution(cls, value: Optional[str]) -> Optional[str]:
+        """Share one string object per institution across all records"""
+        return sys.intern(value) if value is not None else None
+
+    @property
+    def is_error(self) -> bool:
+        """Whether the certificate is an error (ERROR filename prefix or ERROR status)"""
+        return self.has_error_prefix or self.status == CertificateStatus.ERROR
+
 
 class CustomerRegistry(BaseModel):
     """
@@ -74,6 +86,32 @@ class CustomerRegistry(BaseModel):
     total_customers: int = Field(default=0)
     total_certificates: int = Field(default=0)
 
+    # customer_id -> certificates; kept in step with `certificates`
+    # (private, so it is not serialized)
+    _by_customer: Dict[str, List[CertificateRecord]] = PrivateAttr(default_factory=dict)
+
+    # Certificates marked with ERROR, in registry order
+    _errors: List[CertificateRecord] = PrivateAttr(default_factory=list)
+
+    def model_post_init(self, __context: Any) -> None:
+        """Index certificates passed to the constructor (e.g. when loading)"""
+        self.rebuild_index()
+
+    def rebuild_index(self) -> None:
+        """Rebuild the certificate lookup indexes from `certificates`"""
+        self._by_customer = {}
+        self._errors = []
+        self._index_certificates(self.certificates)
+
+    def _index_certificates(self, certificates: Iterable[CertificateRecord]) -> None:
+        """Add certificates to the lookup indexes"""
+        by_customer = self._by_customer
+        errors = self._errors
+        for cert in certificates:
+            by_customer.setdefault(cert.customer_id, []).append(cert)
+            if cert.is_error:
+                errors.append(cert)
+
     def add_customer(self, customer: Customer) -> None:
         """Add a customer to the registry"""
         self.customers.append(customer)
@@ -83,13 +121,26 @@ class CustomerRegistry(BaseModel):
     def add_certificate(self, certificate: CertificateRecord) -> None:
         """Add a certificate to the registry"""
         self.certificates.append(certificate)
+        self._index_certificates((certificate,))
+        self.total_certificates = len(self.certificates)
+        self.last_updated = datetime.now()
+
+    def extend_certificates(self, certificates: Iterable[CertificateRecord]) -> None:
+        """Add several certificates to the registry at once"""
+        certificates = list(certificates)
+        self.certificates.extend(certificates)
+        self._index_certificates(certificates)
         self.total_certificates = len(self.certificates)
         self.last_updated = datetime.now()
 
     def get_customer_certificates(self, customer_id: str) -> List[CertificateRecord]:
         """Get all certificates for a specific customer"""
-        return [cert for cert in self.certificates if cert.customer_id == customer_id]
+        return list(self._by_customer.get(customer_id, ()))
+
+    def count_customer_certificates(self, customer_id: str) -> int:
+        """Count certificates for a specific customer without copying them"""
+        return len(self._by_customer.get(customer_id, ()))
 
     def get_error_certificates(self) -> List[CertificateRecord]:
         """Get all certificates marked with ERROR"""
-        return [cert for cert in self.certificates if cert.has_error_prefix or cert.status == CertificateStatus.ERROR]
+        return list(self._errors)
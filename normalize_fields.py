@@ -14,17 +14,141 @@ Usage: python3 normalize_fields.py <extracted_json_file>
 Example: python3 normalize_fields.py "Acta de Girtec S.A_extracted.json"
 """
 
+import os
 import sys
 import json
 import re
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Tuple
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+# Spanish month mapping
+_MONTHS_ES = {
+    'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4,
+    'mayo': 5, 'junio': 6, 'julio': 7, 'agosto': 8,
+    'septiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12,
+    'set': 9, 'oct': 10, 'nov': 11, 'dic': 12
+}
+
+# Translation table deleting every non-digit ASCII character
+_DELETE_NON_DIGITS = str.maketrans('', '', ''.join(
+    chr(c) for c in range(128) if not chr(c).isdigit()
+))
+
+# Longest names first so e.g. "octubre" wins over "oct"
+_MONTHS_ES_ALT = '|'.join(sorted(_MONTHS_ES, key=len, reverse=True))
+
+# Patterns compiled once at import instead of per call
+# Pattern: "11 de octubre 2012" or "11/10/2012" or "2012-10-11"
+# Formatters return (year, month, day) integers
+_DATE_PATTERNS = (
+    # ISO format
+    (re.compile(r'(\d{4})-(\d{2})-(\d{2})', re.IGNORECASE),
+     lambda m: (int(m.group(1)), int(m.group(2)), int(m.group(3)))),
+    # DD/MM/YYYY
+    (re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})', re.IGNORECASE),
+     lambda m: (int(m.group(3)), int(m.group(2)), int(m.group(1)))),
+    # DD de MONTH YYYY (Spanish)
+    (re.compile(rf'(\d{{1,2}})\s+de\s+({_MONTHS_ES_ALT})\s+(\d{{4}})', re.IGNORECASE),
+     lambda m: (int(m.group(3)), _MONTHS_ES[m.group(2).lower()], int(m.group(1)))),
+)
+
+
+# Institution keywords, in priority order (the first institution matching wins)
+_INSTITUTIONS = {
+    'DGI': ['DGI', 'DIRECCION GENERAL IMPOSITIVA'],
+    'BPS': ['BPS', 'BANCO DE PREVISION SOCIAL'],
+    'MSP': ['MSP', 'MINISTERIO DE SALUD PUBLICA'],
+    'BCU': ['BCU', 'BANCO CENTRAL'],
+    'ABITAB': ['ABITAB'],
+    'NOTARIA': ['NOTARIA', 'ESCRIBANO', 'ACTA']
+}
+_INSTITUTION_BY_KEYWORD = {
+    kw: (rank, inst)
+    for rank, (inst, keywords) in enumerate(_INSTITUTIONS.items())
+    for kw in keywords
+}
+
+# Role keywords found in other_fields keys, in output order
+_ROLE_LABELS = {
+    'presidente': 'Presidente',
+    'secretario': 'Secretario',
+    'director': 'Director',
+    'apoderado': 'Apoderado',
+    'representante': 'Representante Legal'
+}
+
+# One-pass scan for every institution keyword; the lookahead makes
+# finditer report each occurrence, even where keywords overlap
+_INSTITUTION_RE = re.compile('(?=({}))'.format('|'.join(
+    re.escape(kw) for kw in sorted(_INSTITUTION_BY_KEYWORD, key=len, reverse=True)
+)))
+
+# Keys are matched first with this single alternation; only keys that name
+# a role are then checked against each keyword
+_ROLE_RE = re.compile('|'.join(_ROLE_LABELS))
+
+
+def _only_digits(value: str) -> str:
+    """Strip every non-digit character (same result as re.sub(r'\\D', '', value))"""
+    if value.isascii():
+        return value.translate(_DELETE_NON_DIGITS)
+    # Other Unicode decimal digits are kept, as \d would
+    return ''.join(filter(str.isdecimal, value))
+
+
+@lru_cache(maxsize=8192)
+def _parse_date(date_str: str) -> Tuple[Optional[str], str]:
+    """
+    Parse a date string to ISO format (YYYY-MM-DD).
+    Pure and cached, since the same dates recur across fields and documents.
+    Returns (normalized or None, confidence)
+    """
+    # Fast path: already ISO (YYYY-MM-DD), the most common input
+    if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+        try:
+            datetime.fromisoformat(date_str)
+            return date_str, "high"
+        except ValueError:
+            pass
+
+    for pattern, formatter in _DATE_PATTERNS:
+        match = pattern.search(date_str)
+        if match:
+            try:
+                year, month, day = formatter(match)
+                # Validate it's a real date (cheaper than strptime)
+                datetime(year, month, day)
+                return f"{year:04d}-{month:02d}-{day:02d}", "high"
+            except (ValueError, KeyError):
+                continue
+
+    return None, "low"
+
+
+def _normalize_documents(documents: List[Dict], normalized_at: str) -> List[Dict]:
+    """Normalize a chunk of documents with one FieldNormalizer (batch worker)"""
+    normalizer = FieldNormalizer()
+    return [normalizer.normalize_document(doc, normalized_at) for doc in documents]
 
 
 class FieldNormalizer:
     """Normalize and validate extracted fields from certificates"""
 
+    # Minimum documents per worker process; smaller batches are normalized
+    # in-process, where pool start-up and pickling would dominate
+    BATCH_CHUNK_SIZE = 256
+
     def __init__(self):
         self.conflicts = []
         self.missing_fields = []
@@ -35,19 +159,12 @@ class FieldNormalizer:
         if not name or name == "null":
             return None
 
-        # Remove extra whitespace
-        name = re.sub(r'\s+', ' ', name.strip())
-
-        # Title case for each word, preserving abbreviations
-        words = []
-        for word in name.split():
-            # Keep abbreviations uppercase (S.A., Dr., etc.)
-            if '.' in word or word.isupper() and len(word) <= 4:
-                words.append(word)
-            else:
-                words.append(word.title())
-
-        return ' '.join(words)
+        # Title case for each word (split() also collapses extra whitespace),
+        # keeping abbreviations uppercase (S.A., Dr., etc.)
+        return ' '.join([
+            word if '.' in word or word.isupper() and len(word) <= 4 else word.title()
+            for word in name.split()
+        ])
 
     def normalize_rut(self, rut: Optional[str]) -> Optional[str]:
         """Normalize RUT format to: 12-345678-001-2"""
@@ -55,7 +172,7 @@ class FieldNormalizer:
             return None
 
         # Remove all non-digit characters
-        digits = re.sub(r'\D', '', rut)
+        digits = _only_digits(rut)
 
         # RUT format: XX-XXXXXX-XXX-X (12 digits)
         if len(digits) == 12:
@@ -75,7 +192,7 @@ class FieldNormalizer:
             return None
 
         # Remove all non-digit characters
-        digits = re.sub(r'\D', '', ci)
+        digits = _only_digits(ci)
 
         # CI format: X.XXX.XXX-X (7-8 digits)
         if len(digits) == 7:
@@ -104,92 +221,48 @@ class FieldNormalizer:
         if not date_str or date_str == "null":
             return {"normalized": None, "original": None, "confidence": "missing"}
 
-        original = date_str
-
-        # Spanish month mapping
-        months_es = {
-            'enero': 1, 'febrero': 2, 'marzo': 3, 'abril': 4,
-            'mayo': 5, 'junio': 6, 'julio': 7, 'agosto': 8,
-            'septiembre': 9, 'octubre': 10, 'noviembre': 11, 'diciembre': 12,
-            'set': 9, 'oct': 10, 'nov': 11, 'dic': 12
-        }
-
-        # Pattern: "11 de octubre 2012" or "11/10/2012" or "2012-10-11"
-        patterns = [
-            # ISO format
-            (r'(\d{4})-(\d{2})-(\d{2})', lambda m: f"{m.group(1)}-{m.group(2)}-{m.group(3)}"),
-            # DD/MM/YYYY
-            (r'(\d{1,2})/(\d{1,2})/(\d{4})', lambda m: f"{m.group(3)}-{int(m.group(2)):02d}-{int(m.group(1)):02d}"),
-            # DD de MONTH YYYY (Spanish)
-            (r'(\d{1,2})\s+de\s+(\w+)\s+(\d{4})',
-             lambda m: f"{m.group(3)}-{months_es.get(m.group(2).lower(), 0):02d}-{int(m.group(1)):02d}")
-        ]
-
-        for pattern, formatter in patterns:
-            match = re.search(pattern, date_str, re.IGNORECASE)
-            if match:
-                try:
-                    normalized = formatter(match)
-                    # Validate it's a real date
-                    datetime.strptime(normalized, '%Y-%m-%d')
-                    return {
-                        "normalized": normalized,
-                        "original": original,
-                        "confidence": "high"
-                    }
-                except (ValueError, KeyError):
-                    continue
+        normalized, confidence = _parse_date(date_str)
 
         # If no pattern matched
-        self.low_confidence.append({
-            "field": "date",
-            "value": date_str,
-            "reason": "Could not parse date format"
-        })
+        if normalized is None:
+            self.low_confidence.append({
+                "field": "date",
+                "value": date_str,
+                "reason": "Could not parse date format"
+            })
 
         return {
-            "normalized": None,
-            "original": original,
-            "confidence": "low"
+            "normalized": normalized,
+            "original": date_str,
+            "confidence": confidence
         }
 
-    def extract_institution(self, document_type: Optional[str], text: str) -> Optional[str]:
-        """Extract institution name from document type or text"""
+    def extract_institution(self, document_type: Optional[str], text: Optional[str] = None) -> Optional[str]:
+        """
+        Extract institution name from the document type.
+        text is accepted for compatibility but not scanned
+        """
         if not document_type:
             return None
 
-        institutions = {
-            'DGI': ['DGI', 'DIRECCION GENERAL IMPOSITIVA'],
-            'BPS': ['BPS', 'BANCO DE PREVISION SOCIAL'],
-            'MSP': ['MSP', 'MINISTERIO DE SALUD PUBLICA'],
-            'BCU': ['BCU', 'BANCO CENTRAL'],
-            'ABITAB': ['ABITAB'],
-            'NOTARIA': ['NOTARIA', 'ESCRIBANO', 'ACTA']
-        }
-
-        doc_upper = document_type.upper()
-        for inst, keywords in institutions.items():
-            if any(kw in doc_upper for kw in keywords):
-                return inst
-
-        return None
+        # Scan once for all keywords, then pick the highest-priority institution
+        matches = [_INSTITUTION_BY_KEYWORD[m.group(1)] for m in _INSTITUTION_RE.finditer(document_type.upper())]
+        if not matches:
+            return None
+        return min(matches)[1]
 
     def extract_roles(self, other_fields: Dict) -> List[Dict[str, str]]:
         """Extract person roles from other_fields"""
         roles = []
 
-        role_mapping = {
-            'presidente': 'Presidente',
-            'secretario': 'Secretario',
-            'director': 'Director',
-            'apoderado': 'Apoderado',
-            'representante': 'Representante Legal'
-        }
-
         for key, value in other_fields.items():
             key_lower = key.lower()
-            for role_key, role_label in role_mapping.items():
-                if role_key in key_lower and value:
+            if not value or not _ROLE_RE.search(key_lower):
+                continue
+
+            # A key naming several roles (e.g. presidente_secretario) yields each
+            for role_key, role_label in _ROLE_LABELS.items():
+                if role_key in key_lower:
                     roles.append({
                         "role": role_label,
                         "name": self.normalize_name(value),
@@ -237,10 +310,7 @@ class FieldNormalizer:
             normalized[field_mapping[date_field]] = normalized_date
 
         # Extract institution
-        normalized["institution"] = self.extract_institution(
-            extracted_data.get("document_type"),
-            json.dumps(extracted_data)
-        )
+        normalized["institution"] = self.extract_institution(extracted_data.get("document_type"))
 
         # Extract roles from other_fields
         other_fields = extracted_data.get("other_fields", {})
@@ -251,15 +321,47 @@ class FieldNormalizer:
 
         return normalized
 
-    def generate_output(self, normalized_fields: Dict) -> Dict:
-        """Generate final output with conflicts and missing fields"""
+    def normalize_document(self, extracted_data: Dict, normalized_at: Optional[str] = None) -> Dict:
+        """Normalize one document and return its full output (see generate_output)"""
+        return self.generate_output(self.normalize_extracted_data(extracted_data), normalized_at)
+
+    def normalize_batch(self, documents: List[Dict], max_workers: Optional[int] = None) -> List[Dict]:
+        """
+        Normalize many extracted documents.
+        Returns one generate_output() result per document, in input order,
+        all sharing one normalized_at timestamp. Large batches are split
+        across worker processes since normalization is CPU-bound.
+        """
+        normalized_at = datetime.now().isoformat()
+        workers = max_workers or os.cpu_count() or 1
+
+        if workers == 1 or len(documents) < 2 * self.BATCH_CHUNK_SIZE:
+            return [self.normalize_document(doc, normalized_at) for doc in documents]
+
+        chunk_size = max(self.BATCH_CHUNK_SIZE, -(-len(documents) // workers))
+        chunks = [documents[i:i + chunk_size] for i in range(0, len(documents), chunk_size)]
+
+        outputs = []
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            for chunk_outputs in executor.map(_normalize_documents, chunks, repeat(normalized_at)):
+                outputs.extend(chunk_outputs)
+        return outputs
+
+    def generate_output(self, normalized_fields: Dict, normalized_at: Optional[str] = None) -> Dict:
+        """
+        Generate final output with conflicts and missing fields.
+        Batch callers can pass one preformatted normalized_at for all documents.
+        """
+        if normalized_at is None:
+            normalized_at = datetime.now().isoformat()
+
         return {
             "normalized_fields": normalized_fields,
             "conflicts": self.conflicts,
             "missing": self.missing_fields,
             "low_confidence": self.low_confidence,
             "metadata": {
-                "normalized_at": datetime.now().isoformat(),
+                "normalized_at": normalized_at,
                 "total_conflicts": len(self.conflicts),
                 "total_missing": len(self.missing_fields),
                 "total_low_confidence": len(self.low_confidence)
@@ -281,9 +383,12 @@ def main():
         print(f"Error: File not found: {input_file}")
         sys.exit(1)
 
-    # Load extracted data
-    with open(input_file, 'r', encoding='utf-8') as f:
-        extracted_data = json.load(f)
+    # Load extracted data (orjson when installed)
+    if ORJSON_AVAILABLE:
+        extracted_data = orjson.loads(Path(input_file).read_bytes())
+    else:
+        with open(input_file, 'r', encoding='utf-8') as f:
+            extracted_data = json.load(f)
 
     print("=" * 70)
     print("  MILESTONE 4: FIELD NORMALIZATION")
@@ -299,8 +404,14 @@ def main():
     base_name = Path(input_file).stem.replace('_extracted', '')
     output_file = f"{base_name}_normalized.json"
 
+    # Encode once; the same text is saved and displayed
+    if ORJSON_AVAILABLE:
+        output_json = orjson.dumps(output, option=orjson.OPT_INDENT_2).decode('utf-8')
+    else:
+        output_json = json.dumps(output, indent=2, ensure_ascii=False)
+
     with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(output, f, indent=2, ensure_ascii=False)
+        f.write(output_json)
 
     # Display results
     print(f"\n✓ Normalized {len(normalized_fields)} field groups")
@@ -314,7 +425,7 @@ def main():
     print("\n" + "=" * 70)
     print("  NORMALIZED OUTPUT")
     print("=" * 70)
-    print(json.dumps(output, indent=2, ensure_ascii=False))
+    print(output_json)
 
     print("\n" + "=" * 70)
     print("✓ Normalization complete!")
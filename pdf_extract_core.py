@@ -0,0 +1,254 @@
+"""
+Shared PDF extraction helpers used by the extract_pdf_data*.py scripts.
+Text extraction (pdfplumber with OCR fallback) and LLM data extraction.
+
+Heavy dependencies (pdfplumber, pdf2image, pytesseract, groq) are imported
+lazily inside the functions that need them.
+"""
+
+import asyncio
+import json
+import re
+
+
+# Documents longer than this are extracted page by page in parallel
+PAGE_FANOUT_THRESHOLD = 5
+
+# Maximum per-page LLM requests in flight (keeps long PDFs under rate limits)
+PAGE_CONCURRENCY = 4
+
+GROQ_MODEL = 'meta-llama/llama-4-maverick-17b-128e-instruct'
+
+EXTRACTION_SYSTEM_PROMPT = "You are a precise data extraction assistant. Extract data EXACTLY as written from ALL pages, preserving all Spanish characters, accents, and formatting. Return only valid JSON."
+
+PAGE_MARKER_RE = re.compile(r'^--- PAGE \d+ ---$', re.MULTILINE)
+
+
+def extract_text_with_ocr(pdf_path: str) -> tuple:
+    """Extract text from scanned PDF using OCR
+    Returns: (text, page_count)
+    """
+    try:
+        from pdf2image import convert_from_path
+        import pytesseract
+
+        print("  - PDF appears to be scanned/image-based, using OCR...")
+
+        # Convert PDF to images
+        images = convert_from_path(pdf_path, dpi=300)
+        page_count = len(images)
+
+        parts = []
+        for i, image in enumerate(images, 1):
+            print(f"  - OCR processing page {i}/{page_count}...")
+            # Use Tesseract OCR with Spanish language support
+            page_text = pytesseract.image_to_string(image, lang='spa+eng')
+            if page_text.strip():
+                parts.append(f"\n--- PAGE {i} ---\n{page_text}\n")
+                print(f"  - Extracted page {i}/{page_count} ({len(page_text.strip())} chars)")
+            else:
+                print(f"  - Warning: Page {i} OCR returned no text")
+
+        text = "".join(parts)
+        return text.strip(), page_count
+    except Exception as e:
+        print(f"Error with OCR extraction: {e}")
+        print("Note: Ensure tesseract-ocr is installed: sudo apt-get install tesseract-ocr tesseract-ocr-spa poppler-utils")
+        return None, 0
+
+
+def extract_text_from_pdf(pdf_path: str) -> tuple:
+    """Extract text from PDF using pdfplumber, fallback to OCR if needed
+    Returns: (text, page_count)
+    """
+    try:
+        import pdfplumber
+
+        # First, try standard text extraction
+        with pdfplumber.open(pdf_path) as pdf:
+            parts = []
+            page_count = len(pdf.pages)
+            print(f"  - Total pages: {page_count}")
+
+            for i, page in enumerate(pdf.pages, 1):
+                page_text = page.extract_text()
+                if page_text:
+                    parts.append(f"\n--- PAGE {i} ---\n{page_text}\n")
+                    print(f"  - Extracted page {i}/{page_count} ({len(page_text)} chars)")
+                else:
+                    print(f"  - Warning: Page {i} has no extractable text")
+            text = "".join(parts)
+
+        # If no text was extracted, use OCR
+        if not text.strip():
+            print("\n  - No text found with standard extraction")
+            return extract_text_with_ocr(pdf_path)
+
+        return text.strip(), page_count
+    except Exception as e:
+        print(f"Error extracting text from PDF: {e}")
+        return None, 0
+
+
+def build_extraction_prompt(pdf_text: str, page_count: int) -> str:
+    """Build the data extraction prompt for a document (or a single page)"""
+    return f"""Extract ALL data from this Uruguayan certificate EXACTLY as written.
+This document has {page_count} page(s). Extract information from ALL pages.
+Do not translate, do not modify. Preserve exact spelling, accents, capitalization, and punctuation.
+
+Certificate text:
+{pdf_text}
+
+Return ONLY valid JSON with these fields (use null if field not found):
+{{
+  "document_type": "Type of certificate (e.g., DGI, BPS, MSP)",
+  "rut": "RUT number if present",
+  "denominacion": "Company/person name exactly as written",
+  "constancia_number": "Certificate/constancia number",
+  "fecha": "Date (preserve format)",
+  "domicilio_fiscal": "Fiscal address exactly as written",
+  "tipo_contribuyente": "Type of taxpayer",
+  "estado": "Status/state",
+  "emision": "Emission/issue date",
+  "vencimiento": "Expiration date",
+  "other_fields": {{}}
+}}
+
+Extract EVERY field you see across ALL {page_count} page(s). If there are additional fields not listed, add them to "other_fields".
+Return ONLY the JSON, no explanations."""
+
+
+def parse_llm_json(result_text: str) -> dict:
+    """Parse a JSON LLM response, removing markdown code blocks if present"""
+    result_text = result_text.strip()
+    if result_text.startswith('```'):
+        result_text = result_text.split('```')[1]
+        if result_text.startswith('json'):
+            result_text = result_text[4:]
+        result_text = result_text.strip()
+
+    return json.loads(result_text)
+
+
+def split_pages(pdf_text: str) -> list:
+    """Split extracted text on its '--- PAGE n ---' markers
+    Returns: list of non-empty page texts
+    """
+    pages = [page.strip() for page in PAGE_MARKER_RE.split(pdf_text)]
+    return [page for page in pages if page]
+
+
+def merge_extracted_data(page_results: list) -> dict:
+    """Merge per-page extraction results in page order
+    Scalars keep the first non-null value, lists are concatenated and
+    other_fields are unioned (first non-null value per key wins).
+    """
+    merged = {}
+    other_fields = {}
+
+    for result in page_results:
+        for key, value in result.items():
+            if key == 'other_fields':
+                for field, field_value in (value or {}).items():
+                    if other_fields.get(field) is None:
+                        other_fields[field] = field_value
+            elif isinstance(value, list):
+                merged[key] = (merged.get(key) or []) + value
+            elif merged.get(key) is None:
+                merged[key] = value
+
+    merged['other_fields'] = other_fields
+    return merged
+
+
+async def extract_data_per_page(pages: list, api_key: str) -> dict:
+    """Extract structured data from each page concurrently and merge the results
+    At most PAGE_CONCURRENCY requests run at once.
+    Returns: merged data, or None if any page failed (the caller then falls
+    back to a single whole-document request rather than merge partial data)
+    """
+    from groq import AsyncGroq
+
+    semaphore = asyncio.Semaphore(PAGE_CONCURRENCY)
+
+    async with AsyncGroq(api_key=api_key) as client:
+
+        async def extract_page(page_text: str) -> dict:
+            async with semaphore:
+                response = await client.chat.completions.create(
+                    model=GROQ_MODEL,
+                    messages=[
+                        {"role": "system", "content": EXTRACTION_SYSTEM_PROMPT},
+                        {"role": "user", "content": build_extraction_prompt(page_text, 1)}
+                    ],
+                    temperature=0,
+                    max_tokens=2500
+                )
+            return parse_llm_json(response.choices[0].message.content)
+
+        page_results = await asyncio.gather(
+            *(extract_page(page) for page in pages),
+            return_exceptions=True
+        )
+
+    failures = [(i, r) for i, r in enumerate(page_results, 1) if isinstance(r, Exception)]
+    if failures:
+        for page_number, error in failures:
+            print(f"  - Warning: page {page_number} extraction failed: {error}")
+        return None
+
+    return merge_extracted_data(page_results)
+
+
+def extract_data_with_llm(pdf_text: str, api_key: str, page_count: int) -> dict:
+    """Extract structured data using Groq Llama 4"""
+    try:
+        # Long documents: bounded per-call latency by fanning out one call per page
+        if page_count > PAGE_FANOUT_THRESHOLD:
+            pages = split_pages(pdf_text)
+            if len(pages) > 1:
+                print(f"  - Sending {len(pages)} pages to LLM in parallel...")
+                extracted_data = asyncio.run(extract_data_per_page(pages, api_key))
+                if extracted_data is not None:
+                    return extracted_data
+                print("  - Falling back to a single whole-document request...")
+
+        from groq import Groq
+
+        client = Groq(api_key=api_key)
+
+        # Output grows with page count; only long documents need the larger budget
+        extraction_max_tokens = min(4000, max(2500, 600 + 300 * page_count))
+
+        print(f"  - Sending {len(pdf_text)} characters to LLM...")
+
+        response = client.chat.completions.create(
+            model=GROQ_MODEL,
+            messages=[
+                {
+                    "role": "system",
+                    "content": EXTRACTION_SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": build_extraction_prompt(pdf_text, page_count)
+                }
+            ],
+            temperature=0,
+            max_tokens=extraction_max_tokens
+        )
+
+        # Parse JSON response
+        extracted_data = parse_llm_json(response.choices[0].message.content)
+        return extracted_data
+
+    except Exception as e:
+        print(f"Error with Groq API: {e}")
+        return None
+
+
+def save_extracted_data(data: dict, output_path: str):
+    """Save extracted data to JSON file"""
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+    print(f"✓ Saved to: {output_path}")
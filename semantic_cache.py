@@ -0,0 +1,124 @@
+"""
+Track B - Milestone 3: Semantic Cache
+Reuses LLM validation results for near-duplicate certificate texts.
+
+Certificates often share boilerplate and differ only in names or dates,
+so a previous validation result is returned when a new document's
+embedding is close enough (cosine similarity) to one already validated.
+"""
+
+import json
+from pathlib import Path
+from typing import Optional
+
+try:
+    import faiss
+    import numpy as np
+    from sentence_transformers import SentenceTransformer
+    SEMANTIC_CACHE_AVAILABLE = True
+except ImportError:
+    SEMANTIC_CACHE_AVAILABLE = False
+
+
+class SemanticCache:
+    """
+    Disk-backed cache of (text embedding -> validation result).
+    Uses a FAISS inner-product index over normalized embeddings.
+    """
+
+    DEFAULT_MODEL = 'sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2'
+
+    # Characters per chunk; chunk embeddings are averaged so the whole
+    # document is covered despite the model's short input window
+    CHUNK_CHARS = 1000
+
+    def __init__(
+        self,
+        cache_dir: str = "./data/semantic_cache",
+        model_name: str = DEFAULT_MODEL,
+        threshold: float = 0.97
+    ):
+        """
+        Initialize semantic cache.
+
+        Args:
+            cache_dir: Directory storing the FAISS index and cached results
+            model_name: sentence-transformers model used for embeddings
+            threshold: Minimum cosine similarity for a cache hit
+        """
+        if not SEMANTIC_CACHE_AVAILABLE:
+            raise ImportError(
+                "Semantic cache requires faiss-cpu and sentence-transformers"
+            )
+
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.cache_dir / "index.faiss"
+        self.entries_file = self.cache_dir / "entries.json"
+        self.threshold = threshold
+
+        self.model = SentenceTransformer(model_name)
+        dimension = self.model.get_sentence_embedding_dimension()
+
+        if self.index_file.exists() and self.entries_file.exists():
+            self.index = faiss.read_index(str(self.index_file))
+            with open(self.entries_file, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        else:
+            self.index = faiss.IndexFlatIP(dimension)
+            self.entries = []
+
+        self._last_text = None
+        self._last_embedding = None
+
+    def _embed(self, text: str):
+        """Embed text as the normalized mean of its chunk embeddings"""
+        if text == self._last_text:
+            return self._last_embedding
+
+        chunks = [
+            text[i:i + self.CHUNK_CHARS]
+            for i in range(0, max(len(text), 1), self.CHUNK_CHARS)
+        ]
+        chunk_embeddings = self.model.encode(chunks, normalize_embeddings=True)
+
+        embedding = chunk_embeddings.mean(axis=0, keepdims=True).astype(np.float32)
+        faiss.normalize_L2(embedding)
+
+        self._last_text = text
+        self._last_embedding = embedding
+        return embedding
+
+    def lookup(self, text: str) -> Optional[dict]:
+        """
+        Find a cached result for a similar document.
+
+        Args:
+            text: Document text
+
+        Returns:
+            Cached result dict or None on a miss
+        """
+        if self.index.ntotal == 0:
+            return None
+
+        scores, ids = self.index.search(self._embed(text), 1)
+        if scores[0][0] >= self.threshold:
+            return self.entries[ids[0][0]]
+
+        return None
+
+    def store(self, text: str, result: dict) -> None:
+        """
+        Add a result to the cache and persist it to disk.
+
+        Args:
+            text: Document text
+            result: Result to return for similar documents
+        """
+        self.index.add(self._embed(text))
+        self.entries.append(result)
+
+        faiss.write_index(self.index, str(self.index_file))
+        with open(self.entries_file, 'w', encoding='utf-8') as f:
+            json.dump(self.entries, f, ensure_ascii=False)
@@ -4,12 +4,46 @@ Handles persistence of customer registry using JSON files.
 """
 
 import json
+import os
+import shutil
+from operator import attrgetter
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Any, BinaryIO, Iterable, List, Optional
+
+from pydantic import TypeAdapter
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
 from models import CustomerRegistry, Customer, CertificateRecord
 
+# Validate whole lists in one pydantic-core call instead of Model(**item) per item
+_CUSTOMERS_ADAPTER = TypeAdapter(List[Customer])
+_CERTIFICATES_ADAPTER = TypeAdapter(List[CertificateRecord])
+
+
+def _dumps(obj: Any, compact: bool = False) -> bytes:
+    """
+    Encode obj as UTF-8 JSON (orjson when installed).
+    Indented output is identical to json.dumps(obj, indent=2, ensure_ascii=False).
+
+    Args:
+        obj: JSON-serializable object
+        compact: Omit indentation and spaces
+
+    Returns:
+        Encoded JSON
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj) if compact else orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    if compact:
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
+
 
 class StorageManager:
     """
@@ -17,6 +51,10 @@ class StorageManager:
     Uses JSON files for lightweight persistence.
     """
 
+    # Buffer size for JSON output files; many small json writes are
+    # coalesced into few write() syscalls
+    WRITE_BUFFER_SIZE = 1 << 20
+
     def __init__(self, storage_dir: str = "./data"):
         """
         Initialize storage manager.
@@ -31,23 +69,75 @@ class StorageManager:
         self.backup_dir = self.storage_dir / "backups"
         self.backup_dir.mkdir(exist_ok=True)
 
-    def _serialize_registry(self, registry: CustomerRegistry) -> dict:
+    @staticmethod
+    def _write_json_array(
+        f: BinaryIO,
+        key: str,
+        items: Iterable[Any],
+        compact: bool = False,
+        last: bool = False
+    ) -> None:
         """
-        Convert CustomerRegistry to JSON-serializable dict.
+        Write one `"key": [...]` member of a top-level JSON object, dumping
+        the items one at a time instead of building the whole list first.
+        Indented output matches json.dump(..., indent=2) at this nesting level.
 
         Args:
-            registry: CustomerRegistry object
+            f: File open for binary writing
+            key: Member name
+            items: JSON-serializable items (may be a generator)
+            compact: Write without indentation or spaces
+            last: Member is the object's last (no trailing comma)
+        """
+        empty = True
+
+        if compact:
+            f.write(_dumps(key) + b':[')
+            for item in items:
+                if not empty:
+                    f.write(b',')
+                f.write(_dumps(item, compact=True))
+                empty = False
+            f.write(b']' if last else b'],')
+            return
+
+        f.write(b'  ' + _dumps(key) + b': [')
+        for item in items:
+            f.write(b'\n    ' if empty else b',\n    ')
+            # Strings are escaped in JSON, so every newline is indentation
+            f.write(_dumps(item).replace(b'\n', b'\n    '))
+            empty = False
+        f.write(b']' if empty else b'\n  ]')
+        f.write(b'\n' if last else b',\n')
+
+    def _write_registry(self, registry: CustomerRegistry, f: BinaryIO, compact: bool = False) -> None:
+        """
+        Stream CustomerRegistry to an open file as JSON.
 
-        Returns:
-            Dictionary ready for JSON serialization
+        Args:
+            registry: CustomerRegistry object
+            f: File open for binary writing
+            compact: Write without indentation or spaces
         """
-        return {
-            'customers': [customer.model_dump(mode='json') for customer in registry.customers],
-            'certificates': [cert.model_dump(mode='json') for cert in registry.certificates],
+        f.write(b'{' if compact else b'{\n')
+        self._write_json_array(
+            f, 'customers',
+            (customer.model_dump(mode='json') for customer in registry.customers),
+            compact
+        )
+        self._write_json_array(
+            f, 'certificates',
+            (cert.model_dump(mode='json') for cert in registry.certificates),
+            compact
+        )
+
+        footer = {
             'last_updated': registry.last_updated.isoformat(),
             'total_customers': registry.total_customers,
             'total_certificates': registry.total_certificates
         }
+        # Drop the footer's own opening brace (and newline)
+        f.write(_dumps(footer, compact)[1 if compact else 2:])
 
     def _deserialize_registry(self, data: dict) -> CustomerRegistry:
         """
@@ -59,33 +149,52 @@ class StorageManager:
         Returns:
             CustomerRegistry object
         """
+        # Only fall back to now() when the field is missing (no format/parse round trip)
+        if 'last_updated' in data:
+            last_updated = datetime.fromisoformat(data['last_updated'])
+        else:
+            last_updated = datetime.now()
+
         registry = CustomerRegistry(
-            customers=[Customer(**customer) for customer in data.get('customers', [])],
-            certificates=[CertificateRecord(**cert) for cert in data.get('certificates', [])],
-            last_updated=datetime.fromisoformat(data.get('last_updated', datetime.now().isoformat())),
+            customers=_CUSTOMERS_ADAPTER.validate_python(data.get('customers', [])),
+            certificates=_CERTIFICATES_ADAPTER.validate_python(data.get('certificates', [])),
+            last_updated=last_updated,
             total_customers=data.get('total_customers', 0),
             total_certificates=data.get('total_certificates', 0)
         )
         return registry
 
-    def save_registry(self, registry: CustomerRegistry, create_backup: bool = True) -> None:
+    def save_registry(
+        self,
+        registry: CustomerRegistry,
+        create_backup: bool = True,
+        compact: bool = False
+    ) -> None:
         """
         Save customer registry to JSON file.
 
         Args:
             registry: CustomerRegistry to save
             create_backup: Whether to create a backup of existing file
+            compact: Write unindented JSON (smaller and faster; same data)
         """
         # Create backup if file exists
         if create_backup and self.registry_file.exists():
             timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
             backup_file = self.backup_dir / f"registry_backup_{timestamp}.json"
-            backup_file.write_text(self.registry_file.read_text())
-
-        # Save registry
-        data = self._serialize_registry(registry)
-        with open(self.registry_file, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+            try:
+                # The registry is replaced below, never rewritten in place,
+                # so a hard link keeps the old contents without copying them
+                os.link(self.registry_file, backup_file)
+            except OSError:
+                # Existing backup, cross-device or no link support
+                shutil.copyfile(self.registry_file, backup_file)
+
+        # Save registry to a temporary file and swap it in
+        tmp_file = self.registry_file.with_name(self.registry_file.name + '.tmp')
+        with open(tmp_file, 'wb', buffering=self.WRITE_BUFFER_SIZE) as f:
+            self._write_registry(registry, f, compact)
+        os.replace(tmp_file, self.registry_file)
 
     def load_registry(self) -> Optional[CustomerRegistry]:
         """
@@ -94,60 +203,75 @@ class StorageManager:
         Returns:
             CustomerRegistry object or None if file doesn't exist
         """
-        if not self.registry_file.exists():
+        # One read of the whole file; both parsers take UTF-8 bytes directly
+        try:
+            raw = self.registry_file.read_bytes()
+        except FileNotFoundError:
             return None
 
-        with open(self.registry_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = orjson.loads(raw) if ORJSON_AVAILABLE else json.loads(raw)
 
         return self._deserialize_registry(data)
 
-    def export_customer_report(self, registry: CustomerRegistry, output_file: str) -> None:
+    def export_customer_report(
+        self,
+        registry: CustomerRegistry,
+        output_file: str,
+        compact: bool = False
+    ) -> None:
         """
         Export customer registry as a readable JSON report.
 
         Args:
             registry: CustomerRegistry to export
             output_file: Path to output file
+            compact: Write unindented JSON instead of the readable layout
         """
         output_path = Path(output_file)
 
-        report = {
+        header = {
             'generated_at': datetime.now().isoformat(),
             'summary': {
                 'total_customers': registry.total_customers,
                 'total_certificates': registry.total_certificates,
                 'total_errors': len(registry.get_error_certificates())
-            },
-            'customers': []
-        }
-
-        # Add detailed customer info
-        for customer in registry.customers:
-            customer_certs = registry.get_customer_certificates(customer.customer_id)
-            error_certs = [cert for cert in customer_certs if cert.has_error_prefix]
-
-            customer_info = {
-                'name': customer.name,
-                'type': customer.customer_type,
-                'folder': customer.folder_path,
-                'total_certificates': len(customer_certs),
-                'error_certificates': len(error_certs),
-                'certificates': [
-                    {
-                        'filename': cert.filename,
-                        'institution': cert.institution,
-                        'status': cert.status,
-                        'date': cert.date.isoformat() if cert.date else None,
-                        'has_error': cert.has_error_prefix
-                    }
-                    for cert in customer_certs
-                ]
             }
-            report['customers'].append(customer_info)
+        }
 
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        def iter_customers():
+            """Yield detailed customer info one customer at a time"""
+            for customer in registry.customers:
+                # O(1) lookup in the registry's per-customer index
+                customer_certs = registry.get_customer_certificates(customer.customer_id)
+
+                yield {
+                    'name': customer.name,
+                    'type': customer.customer_type,
+                    'folder': customer.folder_path,
+                    'total_certificates': len(customer_certs),
+                    'error_certificates': sum(map(attrgetter('has_error_prefix'), customer_certs)),
+                    'certificates': [
+                        {
+                            'filename': cert.filename,
+                            'institution': cert.institution,
+                            'status': cert.status,
+                            'date': cert.date.isoformat() if cert.date else None,
+                            'has_error': cert.has_error_prefix
+                        }
+                        for cert in customer_certs
+                    ]
+                }
+
+        # Stream the customers; only one customer's info is in memory at a time
+        with open(output_path, 'wb', buffering=self.WRITE_BUFFER_SIZE) as f:
+            if compact:
+                # Header object without its closing brace
+                f.write(_dumps(header, compact)[:-1] + b',')
+            else:
+                # Header object without its closing newline and brace
+                f.write(_dumps(header)[:-2] + b',\n')
+            self._write_json_array(f, 'customers', iter_customers(), compact, last=True)
+            f.write(b'}')
 
     def get_statistics(self, registry: CustomerRegistry) -> dict:
         """
@@ -161,19 +285,21 @@ class StorageManager:
         """
         from collections import Counter
 
+        # Each count is a Counter over map(attrgetter(...)), so the whole
+        # pass runs in C; fusing them into one Python-level loop is slower
+        certificates = registry.certificates
+
         # Count by customer type
-        type_counts = Counter(c.customer_type for c in registry.customers)
+        type_counts = Counter(map(attrgetter('customer_type'), registry.customers))
 
         # Count by institution
-        institution_counts = Counter(
-            cert.institution for cert in registry.certificates if cert.institution
-        )
+        institution_counts = Counter(filter(None, map(attrgetter('institution'), certificates)))
 
         # Count by status
-        status_counts = Counter(cert.status for cert in registry.certificates)
+        status_counts = Counter(map(attrgetter('status'), certificates))
 
         # Customers with most certificates
-        customer_cert_counts = Counter(cert.customer_id for cert in registry.certificates)
+        customer_cert_counts = Counter(map(attrgetter('customer_id'), certificates))
         top_customers = customer_cert_counts.most_common(10)
 
         # Map customer IDs to names